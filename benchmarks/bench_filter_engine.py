@@ -0,0 +1,106 @@
+"""
+Filter engine benchmark: chained per-predicate frames vs one compiled mask vs a memo hit.
+
+Builds a prepared synthetic dataset against the local TMDB stand-in (genre and
+language lookups only) and times a few sidebar filter states each way.
+
+    python -m benchmarks.bench_filter_engine --rows 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_tmdb import FakeTMDB, synthetic_movies
+from benchmarks.bench_ingest import point_config_at
+from benchmarks.bench_load import timed
+
+DEFAULTS = {
+    "min_rating": 7.5,
+    "max_popularity": 20.0,
+    "min_vote_count": 50,
+    "genres": [],
+    "genre_match": "any",
+    "exclude_genres": [],
+    "adult": False,
+    "include_missing_dates": False,
+    "min_year": 1950,
+    "max_year": 2026,
+    "original_language_name": "All",
+}
+
+CASES = [
+    ("defaults", {}),
+    ("loose", {"min_rating": 6.0, "max_popularity": 100.0, "min_vote_count": 10}),
+    ("genres + language", {"genres": ["Drama", "Comedy"], "original_language_name": "French"}),
+]
+
+
+def chained_filter(df, filters):
+    """The previous filter_df: a copy, then one filtered frame per predicate."""
+    from utils.data_processing import genre_rows
+
+    out = df.copy()
+    if not filters["adult"]:
+        out = out[out["adult"] == False]  # noqa: E712
+    if filters["genres"] or filters["exclude_genres"]:
+        out = out[genre_rows(out, filters["genres"], filters["genre_match"], filters["exclude_genres"])]
+    if filters["original_language_name"] != "All":
+        out = out[out["original_language_name"] == filters["original_language_name"]]
+    out = out[out["vote_average"] >= filters["min_rating"]]
+    out = out[out["popularity"] <= filters["max_popularity"]]
+    out = out[out["vote_count"] >= filters["min_vote_count"]]
+    if filters["min_year"] is not None:
+        out = out[out["year"] >= filters["min_year"]]
+    if filters["max_year"] is not None:
+        out = out[out["year"] <= filters["max_year"]]
+    if not filters["include_missing_dates"]:
+        out = out[out["release_date"].notna()]
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("TMDB_BEARER_TOKEN", "benchmark")
+    os.chdir(tempfile.mkdtemp(prefix="moviever-bench-"))
+
+    import config
+
+    config.HTTP_CACHE_ENABLED = False
+    server = FakeTMDB([], latency=0).start()
+    point_config_at(server.root)
+
+    from utils.columnar import ColumnBuilder
+    from utils.data_processing import filter_df, prepare_df
+    from utils.snapshot_persistence import map_snapshot, publish_snapshot
+
+    print(f"{'rows':>9}{'filters':>20}{'chained ms':>12}{'compiled ms':>13}{'memo hit ms':>13}{'matches':>10}")
+    for rows in args.rows:
+        builder = ColumnBuilder()
+        builder.add(synthetic_movies(rows))
+        manifest = publish_snapshot(prepare_df(builder.to_frame(), copy=False))
+        df = map_snapshot(manifest)
+
+        for label, overrides in CASES:
+            filters = {**DEFAULTS, **overrides}
+            chained_s, expected = timed(lambda: chained_filter(df, filters))
+            compiled_s, result = timed(lambda: filter_df(df, filters))
+            filter_df(df, filters, manifest["version"])
+            hit_s, _ = timed(lambda: filter_df(df, filters, manifest["version"]))
+            assert result["id"].tolist() == expected["id"].tolist(), label
+            print(
+                f"{rows:>9,}{label:>20}{chained_s * 1e3:>12.1f}{compiled_s * 1e3:>13.1f}"
+                f"{hit_s * 1e3:>13.2f}{len(result):>10,}"
+            )
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
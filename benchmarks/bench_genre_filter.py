@@ -0,0 +1,79 @@
+"""
+Genre filter benchmark: per-row apply over the genre lists vs bitwise genre_mask.
+
+Builds a prepared synthetic dataset against the local TMDB stand-in (genre and
+language lookups only) and times single-genre and multi-genre filters both ways.
+
+    python -m benchmarks.bench_genre_filter --rows 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_tmdb import FakeTMDB, synthetic_movies
+from benchmarks.bench_ingest import point_config_at
+from benchmarks.bench_load import timed
+
+# (label, include, match, exclude)
+CASES = [
+    ("Drama", ["Drama"], "any", []),
+    ("any of 3", ["Drama", "Comedy", "Horror"], "any", []),
+    ("all of 2", ["Drama", "Romance"], "all", []),
+    ("Drama, not Horror", ["Drama"], "any", ["Horror"]),
+]
+
+
+def apply_rows(df, include, match, exclude):
+    """The previous path: one Python call per row."""
+    include, exclude = set(include), set(exclude)
+
+    def matches(genres):
+        genres = set(genres) if isinstance(genres, list) else set()
+        if include and not (include <= genres if match == "all" else include & genres):
+            return False
+        return not exclude & genres
+
+    return df["genres"].apply(matches).to_numpy(dtype=bool)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("TMDB_BEARER_TOKEN", "benchmark")
+    os.chdir(tempfile.mkdtemp(prefix="moviever-bench-"))
+
+    import config
+
+    config.HTTP_CACHE_ENABLED = False
+    server = FakeTMDB([], latency=0).start()
+    point_config_at(server.root)
+
+    from utils.columnar import ColumnBuilder
+    from utils.data_processing import genre_rows, prepare_df
+
+    print(f"{'rows':>9}{'filter':>20}{'apply ms':>10}{'mask ms':>10}{'speedup':>9}{'matches':>10}")
+    for rows in args.rows:
+        builder = ColumnBuilder()
+        builder.add(synthetic_movies(rows))
+        df = prepare_df(builder.to_frame(), copy=False)
+
+        for label, include, match, exclude in CASES:
+            apply_s, expected = timed(lambda: apply_rows(df, include, match, exclude))
+            mask_s, result = timed(lambda: genre_rows(df, include, match, exclude))
+            assert (result == expected).all(), label
+            print(
+                f"{rows:>9,}{label:>20}{apply_s * 1e3:>10.1f}{mask_s * 1e3:>10.2f}"
+                f"{apply_s / mask_s:>8.0f}x{int(result.sum()):>10,}"
+            )
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Ingestion benchmarks against the local TMDB stand-in server.
+
+Runs fetch_tmdb_all_pages and a cold background rebuild at several concurrency
+levels and reports pages/sec and time-to-dataset. No real TMDB token or network access is needed.
+
+    python -m benchmarks.bench_ingest --movies 20000 --latency 0.05 --workers 1 4 8 16
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_tmdb import FakeTMDB, synthetic_movies
+
+
+def point_config_at(root: str) -> None:
+    """Redirect every TMDB URL in config to the fake server."""
+    import config
+
+    config.TMDB_BASE_URL = f"{root}/discover/movie"
+    config.TMDB_GENRE_URL = f"{root}/genre/movie/list"
+    config.TMDB_LANGUAGES_URL = f"{root}/configuration/languages"
+    config.TMDB_CHANGES_URL = f"{root}/movie/changes"
+    config.TMDB_MOVIE_URL = root + "/movie/{movie_id}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--movies", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.05, help="per-request latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="429 probability")
+    parser.add_argument("--rate", type=float, default=1000.0, help="client token-bucket rate (req/s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--max-pages", type=int, default=500)
+    parser.add_argument("--mode", choices=["partitioned", "single"], default="partitioned")
+    args = parser.parse_args()
+
+    # Isolate every on-disk artifact (CSV, journals, caches) in a scratch directory
+    os.environ.setdefault("TMDB_BEARER_TOKEN", "benchmark")
+    os.chdir(tempfile.mkdtemp(prefix="moviever-bench-"))
+
+    import config
+
+    config.HTTP_CACHE_ENABLED = False  # measure the network path, not the disk cache
+    config.TMDB_FETCH_WORKERS = max(args.workers)  # sizes the HTTP connection pool
+    config.TMDB_PARTITIONED_CRAWL = args.mode == "partitioned"
+
+    server = FakeTMDB(
+        synthetic_movies(args.movies),
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit_prob=args.rate_limit,
+    ).start()
+    point_config_at(server.root)
+
+    from utils.memo import clear_all
+    from utils.fetch_engine import reset_rate_limiter
+    from utils.tmdb_api import fetch_tmdb_all_pages
+    from utils.background_refresh import DatasetRefresher
+
+    def build_snapshot():
+        refresher = DatasetRefresher()
+        refresher.start(full=True)
+        refresher.wait()
+        if refresher.last_error:
+            raise RuntimeError(refresher.last_error)
+        return refresher.snapshot.df
+
+    print(
+        f"{args.movies:,} movies | latency {args.latency * 1000:.0f}ms "
+        f"+{args.jitter * 1000:.0f}ms | 429 p={args.rate_limit} | mode={args.mode}"
+    )
+    print(f"{'target':<22}{'workers':>8}{'requests':>10}{'429s':>7}{'seconds':>10}{'pages/s':>10}{'rows':>9}")
+
+    def run(name, fn):
+        # Every run starts cold: no snapshot or watermark to delta-sync from
+        clear_all()
+        if os.path.exists(config.CSV_DATA_FILE):
+            os.remove(config.CSV_DATA_FILE)
+        if os.path.exists(config.SYNC_STATE_FILE):
+            os.remove(config.SYNC_STATE_FILE)
+        shutil.rmtree(config.SNAPSHOT_DIR, ignore_errors=True)
+        server.reset_counters()
+        reset_rate_limiter(args.rate, max(args.rate / 2, 1))
+
+        start = time.perf_counter()
+        df = fn()
+        elapsed = time.perf_counter() - start
+
+        rows = len(df) if df is not None else 0
+        print(
+            f"{name:<22}{config.TMDB_FETCH_WORKERS:>8}{server.requests:>10}"
+            f"{server.rate_limited:>7}{elapsed:>10.2f}{server.requests / elapsed:>10.1f}{rows:>9,}"
+        )
+
+    for workers in args.workers:
+        config.TMDB_FETCH_WORKERS = workers
+        run("fetch_tmdb_all_pages", lambda: fetch_tmdb_all_pages(args.max_pages))
+        run("background rebuild", build_snapshot)
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Snapshot load benchmarks: CSV vs Parquet vs memory-mapped Arrow for a prepared synthetic dataset.
+
+Builds the dataset through prepare_df against the local TMDB stand-in (genre and
+language lookups only), then times saving and loading each format.
+
+    python -m benchmarks.bench_load --rows 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_tmdb import FakeTMDB, synthetic_movies
+from benchmarks.bench_ingest import point_config_at
+
+# Columns the sidebar filters and card views read
+FILTER_COLUMNS = [
+    "id", "title", "adult", "genres", "original_language_name", "vote_average",
+    "popularity", "vote_count", "year", "release_date", "gems_score",
+]
+
+
+def timed(fn, repeat: int = 3) -> tuple[float, object]:
+    """Best of repeat runs, in seconds."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("TMDB_BEARER_TOKEN", "benchmark")
+    os.chdir(tempfile.mkdtemp(prefix="moviever-bench-"))
+
+    import config
+
+    config.HTTP_CACHE_ENABLED = False
+    server = FakeTMDB([], latency=0).start()
+    point_config_at(server.root)
+
+    from utils.columnar import ColumnBuilder
+    from utils.data_processing import prepare_df
+    from utils.enrichment import ensure_enrichment_columns
+    from utils.csv_persistence import save_data_to_csv, load_data_from_csv
+    from utils.snapshot_persistence import (
+        ARROW_FILE,
+        PARQUET_FILE,
+        load_snapshot,
+        map_snapshot,
+        publish_snapshot,
+        snapshot_file,
+    )
+
+    print(f"{'rows':>9}{'format':>12}{'save s':>9}{'load s':>9}{'filter cols s':>15}{'size MB':>9}")
+    for rows in args.rows:
+        builder = ColumnBuilder()
+        builder.add(synthetic_movies(rows))
+        df = ensure_enrichment_columns(prepare_df(builder.to_frame(), copy=False))
+
+        save_s, _ = timed(lambda: save_data_to_csv(df), repeat=1)
+        load_s, _ = timed(load_data_from_csv)
+        size = os.path.getsize(config.CSV_DATA_FILE) / 1e6
+        print(f"{rows:>9,}{'csv':>12}{save_s:>9.3f}{load_s:>9.3f}{'-':>15}{size:>9.1f}")
+
+        save_s, manifest = timed(lambda: publish_snapshot(df), repeat=1)
+        load_s, _ = timed(lambda: load_snapshot(manifest=manifest))
+        cols_s, _ = timed(lambda: load_snapshot(FILTER_COLUMNS, manifest))
+        size = os.path.getsize(snapshot_file(manifest, PARQUET_FILE)) / 1e6
+        print(f"{rows:>9,}{'parquet':>12}{save_s:>9.3f}{load_s:>9.3f}{cols_s:>15.3f}{size:>9.1f}")
+
+        load_s, _ = timed(lambda: map_snapshot(manifest))
+        size = os.path.getsize(snapshot_file(manifest, ARROW_FILE)) / 1e6
+        print(f"{rows:>9,}{'arrow mmap':>12}{'-':>9}{load_s:>9.3f}{'-':>15}{size:>9.1f}")
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
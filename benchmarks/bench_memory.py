@@ -0,0 +1,64 @@
+"""
+Memory report: per-column memory of the prepared frame with and without compact dtypes.
+
+Builds a synthetic dataset through prepare_df against the local TMDB stand-in
+(genre and language lookups only), once in each mode, and prints the savings.
+
+    python -m benchmarks.bench_memory --rows 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_tmdb import FakeTMDB, synthetic_movies
+from benchmarks.bench_ingest import point_config_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("TMDB_BEARER_TOKEN", "benchmark")
+    os.chdir(tempfile.mkdtemp(prefix="moviever-bench-"))
+
+    import pandas as pd
+    import config
+
+    config.HTTP_CACHE_ENABLED = False
+    server = FakeTMDB([], latency=0).start()
+    point_config_at(server.root)
+
+    from utils.columnar import ColumnBuilder
+    from utils.data_processing import memory_report, prepare_df
+    from utils.enrichment import ensure_enrichment_columns
+    from utils.snapshot_persistence import map_snapshot, publish_snapshot
+
+    pd.set_option("display.width", 120)
+    for rows in args.rows:
+        builder = ColumnBuilder()
+        builder.add(synthetic_movies(rows))
+        raw = builder.to_frame()
+
+        config.COMPACT_DTYPES = False
+        wide = ensure_enrichment_columns(prepare_df(raw))
+        config.COMPACT_DTYPES = True
+        compact = ensure_enrichment_columns(prepare_df(raw))
+
+        print(f"\n{rows:,} rows, prepared frame")
+        print(memory_report(wide, compact).to_string())
+
+        # What the app actually serves: the mapped snapshot (no text or genre list columns)
+        served = map_snapshot(publish_snapshot(compact))
+        print(f"\n{rows:,} rows, served snapshot (wide vs mapped compact)")
+        print(memory_report(wide, served).to_string())
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
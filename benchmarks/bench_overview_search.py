@@ -0,0 +1,110 @@
+"""
+Plot search benchmark: scanning the overview column vs the published BM25 index.
+
+Publishes a synthetic snapshot (which builds the index), opens the index the way Browse
+All does, and times a few plot queries against a regex scan over the overviews (which
+matches the same rows but cannot rank them). Overviews are drawn from a Zipf-distributed
+vocabulary with the query words planted at fixed frequency ranks, so a query matches a
+realistic share of the catalog.
+
+    python -m benchmarks.bench_overview_search --rows 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_tmdb import FakeTMDB, synthetic_movies
+from benchmarks.bench_ingest import point_config_at
+from benchmarks.bench_load import timed
+
+QUERIES = ["heist", "movies about a heist in Tokyo", "ghost island revenge", "silent detective"]
+
+VOCABULARY = 50000
+# Frequency rank of each query word in the synthetic vocabulary
+PLANTED = {
+    "island": 300,
+    "revenge": 400,
+    "ghost": 800,
+    "detective": 900,
+    "tokyo": 1500,
+    "silent": 2000,
+    "heist": 3000,
+}
+
+
+def zipf_overviews(rows: int, seed: int = 42) -> list[str]:
+    """Overviews of 15-60 words with Zipf word frequencies (like real plot text)."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{rank}" for rank in range(VOCABULARY)], dtype=object)
+    for word, rank in PLANTED.items():
+        words[rank] = word
+    weights = 1.0 / np.arange(1, VOCABULARY + 1) ** 1.07
+    lengths = rng.integers(15, 61, rows)
+    drawn = words[rng.choice(VOCABULARY, lengths.sum(), p=weights / weights.sum())]
+    ends = np.cumsum(lengths)
+    return [" ".join(drawn[end - n : end]) + "." for end, n in zip(ends, lengths)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("TMDB_BEARER_TOKEN", "benchmark")
+    os.chdir(tempfile.mkdtemp(prefix="moviever-bench-"))
+
+    import config
+
+    config.HTTP_CACHE_ENABLED = False
+    server = FakeTMDB([], latency=0).start()
+    point_config_at(server.root)
+
+    import numpy as np
+    import pyarrow as pa
+    from utils.columnar import ColumnBuilder
+    from utils.data_processing import prepare_df
+    from utils.overview_search import build_overview_index, overview_index, tokenize, _is_term
+    from utils.snapshot_persistence import map_snapshot, publish_snapshot
+    from utils.text_store import attach_texts
+
+    print(
+        f"{'rows':>9}  {'query':<32}{'scan ms':>9}{'index ms':>10}{'unranked ms':>13}{'matches':>10}"
+    )
+    for rows in args.rows:
+        builder = ColumnBuilder()
+        builder.add(synthetic_movies(rows))
+        prepared = prepare_df(builder.to_frame(), copy=False)
+        prepared["overview"] = zipf_overviews(rows)
+        build_s, _ = timed(lambda: build_overview_index(prepared["overview"]))
+        manifest = publish_snapshot(prepared)
+        df = map_snapshot(manifest)
+        version = manifest["version"]
+        open_s, index = timed(lambda: overview_index(df, version))
+        print(f"{rows:>9,}  {'(build at publish)':<32}{'':>9}{build_s * 1e3:>10.0f}")
+        print(f"{rows:>9,}  {'(open published)':<32}{'':>9}{open_s * 1e3:>10.1f}")
+
+        overviews = attach_texts(df[["id"]], version)["overview"].str.lower()
+        for query in QUERIES:
+            words = tokenize(pa.array([query])).flatten().to_pylist()
+            words = [w for w, ok in zip(words, _is_term(words)) if ok]
+            pattern = "|".join(rf"\b{w}\b" for w in words)
+            scan_s, hits = timed(lambda: np.flatnonzero(overviews.str.contains(pattern, regex=True)))
+            index_s, (found, _) = timed(lambda: index.search(query))
+            unranked_s, _ = timed(lambda: index.search(query, ranked=False))
+            assert set(found) == set(hits), query
+            print(
+                f"{rows:>9,}  {query:<32}{scan_s * 1e3:>9.1f}{index_s * 1e3:>10.1f}"
+                f"{unranked_s * 1e3:>13.1f}{len(found):>10,}"
+            )
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+prepare_df benchmark: the previous row-wise genre and language mapping vs the vectorized one.
+
+Builds raw synthetic frames, then times both preparation paths against the local TMDB
+stand-in (the genre and language lookups are memoized after the first call) and checks
+that they agree.
+
+    python -m benchmarks.bench_prepare --rows 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_tmdb import FakeTMDB, synthetic_movies
+from benchmarks.bench_ingest import point_config_at
+from benchmarks.bench_load import timed
+
+
+def rowwise_prepare(df):
+    """The previous prepare_df mapping: one Python call per row for each derived column."""
+    import numpy as np
+    import pandas as pd
+    from utils.genre import fetch_genre_map, genre_mask
+    from utils.tmdb_api import fetch_tmdb_lang_codes
+
+    df = df.copy()
+    df["release_date"] = pd.to_datetime(df["release_date"], errors="coerce")
+    df["year"] = df["release_date"].dt.year
+    df["gems_score"] = (
+        (df["vote_average"] * np.log10(df["vote_count"] + 1)) / (df["popularity"] + 1)
+    ).fillna(0)
+
+    genre_map = fetch_genre_map()
+    df["genres"] = df["genre_ids"].apply(
+        lambda ids: [genre_map.get(gid, "Unknown") for gid in ids] if isinstance(ids, list) else []
+    )
+    df["genres_str"] = df["genres"].apply(lambda x: ", ".join(x) if x else "Unknown")
+    df["genre_mask"] = genre_mask(df["genre_ids"])
+
+    lang_map = fetch_tmdb_lang_codes()
+    df["original_language_name"] = df["original_language"].map(
+        lambda x: lang_map.loc[x, "english_name"]
+    )
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("TMDB_BEARER_TOKEN", "benchmark")
+    os.chdir(tempfile.mkdtemp(prefix="moviever-bench-"))
+
+    import config
+
+    config.HTTP_CACHE_ENABLED = False
+    server = FakeTMDB([], latency=0).start()
+    point_config_at(server.root)
+
+    from utils.columnar import ColumnBuilder
+    from utils.data_processing import prepare_df
+
+    print(f"{'rows':>9}{'row-wise s':>12}{'vectorized s':>14}{'speedup':>9}")
+    for rows in args.rows:
+        builder = ColumnBuilder()
+        builder.add(synthetic_movies(rows))
+        raw = builder.to_frame()
+
+        rowwise_s, expected = timed(lambda: rowwise_prepare(raw))
+        vector_s, result = timed(lambda: prepare_df(raw))
+
+        for column in ("genres_str", "original_language_name", "genre_mask"):
+            assert (result[column].astype(object) == expected[column].astype(object)).all(), column
+        assert result["genres"].tolist() == expected["genres"].tolist()
+
+        print(f"{rows:>9,}{rowwise_s:>12.3f}{vector_s:>14.3f}{rowwise_s / vector_s:>8.1f}x")
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Title search benchmark: a linear str.contains scan vs the trigram index.
+
+Builds the index over a synthetic catalog, then times literal, accented and misspelled
+queries. The scan finds nothing for a typo; the index falls back to edit distance.
+"browse ms" is the whole uncached Browse All path (browse_rows on a published, mapped
+snapshot: filters, search and sort), once the version's index has been built.
+
+    python -m benchmarks.bench_title_search --rows 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_tmdb import FakeTMDB, synthetic_movies
+from benchmarks.bench_ingest import point_config_at
+from benchmarks.bench_load import timed
+from benchmarks.bench_filter_engine import DEFAULTS
+
+QUERIES = ["detective", "Shadow Garden", "ghost rivér", "detectve shadw", "montain", "tok"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("TMDB_BEARER_TOKEN", "benchmark")
+    os.chdir(tempfile.mkdtemp(prefix="moviever-bench-"))
+
+    import config
+
+    config.HTTP_CACHE_ENABLED = False
+    server = FakeTMDB([], latency=0).start()
+    point_config_at(server.root)
+
+    import pandas as pd
+    from utils.columnar import ColumnBuilder
+    from utils.data_processing import browse_rows, prepare_df
+    from utils.snapshot_persistence import map_snapshot, publish_snapshot
+    from utils.title_search import TitleIndex
+
+    filters = {**DEFAULTS, "min_rating": 0.0, "max_popularity": 1e9, "min_vote_count": 0}
+
+    print(
+        f"{'rows':>9}  {'query':<16}{'scan ms':>9}{'index ms':>10}{'browse ms':>11}"
+        f"{'scan hits':>11}{'index hits':>12}"
+    )
+    for rows in args.rows:
+        movies = synthetic_movies(rows)
+        titles = pd.Series([movie["original_title"] for movie in movies])
+        build_s, index = timed(lambda: TitleIndex(titles))
+        print(f"{rows:>9,}  {'(build)':<16}{'':>9}{build_s * 1e3:>10.0f}")
+
+        builder = ColumnBuilder()
+        builder.add(movies)
+        manifest = publish_snapshot(prepare_df(builder.to_frame(), copy=False))
+        df = map_snapshot(manifest)
+
+        def browse(query):
+            return browse_rows(df, filters, query, "relevance", False, manifest["version"])
+
+        first_s, _ = timed(lambda: browse("(first query)"), repeat=1)
+        print(f"{rows:>9,}  {'(first browse)':<16}{'':>9}{'':>10}{first_s * 1e3:>11.0f}")
+
+        for query in QUERIES:
+            scan_s, hits = timed(lambda: titles.str.contains(query, case=False, regex=False).sum())
+            index_s, found = timed(lambda: index.search(query))
+            browse_s, _ = timed(lambda: browse(query), repeat=1)  # memoized after one run
+            if hits:
+                # Accents aside, the index finds exactly the scan's hits first
+                assert set(found[:hits]) == set(titles.index[titles.str.contains(query, case=False, regex=False)])
+            print(
+                f"{rows:>9,}  {query:<16}{scan_s * 1e3:>9.1f}{index_s * 1e3:>10.1f}{browse_s * 1e3:>11.1f}"
+                f"{hits:>11,}{len(found):>12,}"
+            )
+
+    server.stop()
+
+if __name__ == "__main__":
+    main()
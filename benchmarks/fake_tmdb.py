@@ -0,0 +1,320 @@
+"""
+Local TMDB stand-in server for ingestion benchmarks.
+
+Serves the endpoints the app uses (discover, genre list, configuration/languages,
+movie changes and movie details) from synthetic or recorded fixtures, with
+configurable latency, 429 injection and page cap.
+
+Run standalone:
+    python -m benchmarks.fake_tmdb --movies 20000 --latency 0.05 --rate-limit 0.02
+Record a fixture from the on-disk response cache of a real crawl:
+    python -m benchmarks.fake_tmdb --record benchmarks/fixtures/recorded.json
+"""
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+GENRES = [
+    (28, "Action"), (12, "Adventure"), (16, "Animation"), (35, "Comedy"),
+    (80, "Crime"), (99, "Documentary"), (18, "Drama"), (10751, "Family"),
+    (14, "Fantasy"), (36, "History"), (27, "Horror"), (10402, "Music"),
+    (9648, "Mystery"), (10749, "Romance"), (878, "Science Fiction"),
+    (10770, "TV Movie"), (53, "Thriller"), (10752, "War"), (37, "Western"),
+]
+
+LANGUAGES = [
+    ("en", "English"), ("fr", "French"), ("es", "Spanish"), ("de", "German"),
+    ("ja", "Japanese"), ("ko", "Korean"), ("it", "Italian"), ("hi", "Hindi"),
+    ("zh", "Mandarin"), ("pt", "Portuguese"), ("sv", "Swedish"), ("ru", "Russian"),
+]
+
+WORDS = (
+    "heist tokyo night city love war ghost river detective family secret island "
+    "summer winter revenge journey dream road king queen shadow storm garden "
+    "letter train song mountain border ocean memory silent last first"
+).split()
+
+PAGE_SIZE = 20
+
+
+def synthetic_movies(count: int, seed: int = 42) -> list[dict]:
+    """Deterministic synthetic catalog shaped like discover results."""
+    rng = random.Random(seed)
+    start = date(1950, 1, 1)
+    span = (date(2026, 12, 31) - start).days
+    movies = []
+    for i in range(count):
+        title = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 4)))
+        movies.append(
+            {
+                "adult": False,
+                "backdrop_path": f"/b{i}.jpg",
+                "genre_ids": rng.sample([g for g, _ in GENRES], rng.randint(1, 3)),
+                "id": 1000 + i,
+                "original_language": rng.choice(LANGUAGES)[0],
+                "original_title": title,
+                "overview": " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 60))),
+                "popularity": round(rng.paretovariate(1.2) * 2, 3),
+                "poster_path": f"/p{i}.jpg",
+                "release_date": (start + timedelta(days=rng.randint(0, span))).isoformat(),
+                "title": title,
+                "video": False,
+                "vote_average": round(rng.uniform(6.0, 9.5), 1),
+                "vote_count": int(10 * rng.paretovariate(0.9)),
+            }
+        )
+    return movies
+
+
+def record_fixture(cache_file: str, out_file: str) -> int:
+    """Extract every discover result from the response cache into a fixture file."""
+    conn = sqlite3.connect(cache_file)
+    movies = {}
+    for url, body in conn.execute("SELECT url, body FROM responses"):
+        if not url.endswith("/discover/movie"):
+            continue
+        for movie in json.loads(zlib.decompress(body)).get("results", []):
+            movies[movie["id"]] = movie
+    with open(out_file, "w", encoding="utf-8") as f:
+        json.dump(list(movies.values()), f)
+    return len(movies)
+
+
+class FakeTMDB:
+    """
+    Threaded HTTP server emulating the TMDB v3 API paths under /3.
+    - latency: seconds added to every response (plus up to `jitter`)
+    - rate_limit_prob: probability of answering 429 with Retry-After
+    - page_cap: highest page number discover will serve (TMDB uses 500)
+    """
+
+    def __init__(
+        self,
+        movies: list[dict],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit_prob: float = 0.0,
+        retry_after: int = 1,
+        page_cap: int = 500,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.movies = sorted(movies, key=lambda m: m["popularity"], reverse=True)
+        self.by_id = {m["id"]: m for m in movies}
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_prob = rate_limit_prob
+        self.retry_after = retry_after
+        self.page_cap = page_cap
+        self.requests = 0
+        self.rate_limited = 0
+        self._matches = {}  # discover filter tuple -> matching movies
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def root(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/3"
+
+    def start(self) -> "FakeTMDB":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.rate_limited = 0
+
+    # --- endpoints -------------------------------------------------------
+
+    def discover(self, q: dict) -> tuple[int, dict]:
+        page = int(q.get("page", 1))
+        if page > self.page_cap:
+            return 422, {"errors": [f"page must be less than or equal to {self.page_cap}"]}
+
+        gte = q.get("primary_release_date.gte", "0000-00-00")
+        lte = q.get("primary_release_date.lte", "9999-99-99")
+        vote_avg = float(q.get("vote_average.gte", 0))
+        vote_gte = int(float(q.get("vote_count.gte", 0)))
+        vote_lte = int(float(q["vote_count.lte"])) if "vote_count.lte" in q else None
+
+        filter_key = (gte, lte, vote_avg, vote_gte, vote_lte)
+        matches = self._matches.get(filter_key)
+        if matches is None:
+            matches = [
+                m
+                for m in self.movies
+                if gte <= m["release_date"] <= lte
+                and m["vote_average"] >= vote_avg
+                and m["vote_count"] >= vote_gte
+                and (vote_lte is None or m["vote_count"] <= vote_lte)
+            ]
+            self._matches[filter_key] = matches
+        total_pages = (len(matches) + PAGE_SIZE - 1) // PAGE_SIZE
+        return 200, {
+            "page": page,
+            "results": matches[(page - 1) * PAGE_SIZE : page * PAGE_SIZE],
+            "total_pages": total_pages,
+            "total_results": len(matches),
+        }
+
+    def movie_details(self, movie_id: int, q: dict) -> tuple[int, dict]:
+        movie = self.by_id.get(movie_id)
+        if movie is None:
+            return 404, {"status_code": 34, "status_message": "Not found"}
+        rng = random.Random(movie_id)
+        genre_names = dict(GENRES)
+        details = {k: v for k, v in movie.items() if k != "genre_ids"}
+        details.update(
+            {
+                "genres": [{"id": g, "name": genre_names[g]} for g in movie["genre_ids"]],
+                "runtime": rng.randint(70, 180),
+                "budget": rng.choice([0, rng.randint(1, 200) * 1_000_000]),
+                "revenue": rng.choice([0, rng.randint(1, 900) * 1_000_000]),
+                "imdb_id": f"tt{movie_id:07d}",
+                "status": "Released",
+                "tagline": "",
+            }
+        )
+        append = q.get("append_to_response", "").split(",")
+        if "credits" in append:
+            details["credits"] = {
+                "cast": [
+                    {"name": f"Actor {rng.randint(1, 5000)}", "order": i}
+                    for i in range(5)
+                ],
+                "crew": [{"name": f"Director {rng.randint(1, 800)}", "job": "Director"}],
+            }
+        if "keywords" in append:
+            details["keywords"] = {
+                "keywords": [
+                    {"id": i, "name": w} for i, w in enumerate(rng.sample(WORDS, 3))
+                ]
+            }
+        return 200, details
+
+    def changes(self, q: dict) -> tuple[int, dict]:
+        page = int(q.get("page", 1))
+        ids = sorted(self.by_id)[:: max(1, len(self.by_id) // 200)]
+        results = [{"id": i, "adult": False} for i in ids]
+        return 200, {
+            "page": page,
+            "results": results[(page - 1) * 100 : page * 100],
+            "total_pages": (len(results) + 99) // 100,
+            "total_results": len(results),
+        }
+
+    def route(self, path: str, q: dict) -> tuple[int, dict | list]:
+        if path == "/3/discover/movie":
+            return self.discover(q)
+        if path == "/3/genre/movie/list":
+            return 200, {"genres": [{"id": g, "name": n} for g, n in GENRES]}
+        if path == "/3/configuration/languages":
+            return 200, [
+                {"iso_639_1": c, "english_name": n, "name": n} for c, n in LANGUAGES
+            ]
+        if path == "/3/movie/changes":
+            return self.changes(q)
+        match = re.fullmatch(r"/3/movie/(\d+)", path)
+        if match:
+            return self.movie_details(int(match.group(1)), q)
+        return 404, {"status_code": 34, "status_message": "Not found"}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                    limited = random.random() < fake.rate_limit_prob
+                    if limited:
+                        fake.rate_limited += 1
+
+                delay = fake.latency + random.uniform(0, fake.jitter)
+                if delay:
+                    time.sleep(delay)
+
+                if limited:
+                    status, payload = 429, {"status_code": 25, "status_message": "Rate limited"}
+                else:
+                    url = urlparse(self.path)
+                    query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                    status, payload = fake.route(url.path, query)
+
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if limited:
+                    self.send_header("Retry-After", str(fake.retry_after))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local TMDB stand-in server")
+    parser.add_argument("--movies", type=int, default=20000, help="synthetic catalog size")
+    parser.add_argument("--fixture", help="JSON list of discover results to serve instead")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="429 probability")
+    parser.add_argument("--page-cap", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--record", metavar="OUT", help="write a fixture from the response cache and exit")
+    parser.add_argument("--cache-file", default=".tmdb_cache/responses.sqlite")
+    args = parser.parse_args()
+
+    if args.record:
+        count = record_fixture(args.cache_file, args.record)
+        print(f"Recorded {count:,} movies to {args.record}")
+        return
+
+    if args.fixture:
+        with open(args.fixture, encoding="utf-8") as f:
+            movies = json.load(f)
+    else:
+        movies = synthetic_movies(args.movies)
+
+    server = FakeTMDB(
+        movies,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit_prob=args.rate_limit,
+        page_cap=args.page_cap,
+        port=args.port,
+    ).start()
+    print(f"Serving {len(movies):,} movies at {server.root} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,10 +12,52 @@ Secrets (API keys, tokens) are stored in .env file, not here.
 TMDB_BASE_URL = "https://api.themoviedb.org/3/discover/movie"
 TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w342"
 TMDB_GENRE_URL = "https://api.themoviedb.org/3/genre/movie/list"
+TMDB_LANGUAGES_URL = "https://api.themoviedb.org/3/configuration/languages"
+TMDB_CHANGES_URL = "https://api.themoviedb.org/3/movie/changes"
+TMDB_MOVIE_URL = "https://api.themoviedb.org/3/movie/{movie_id}"
 
 MAX_TMDB_PAGES = 500
 DEFAULT_FETCH_PAGES = 500
 
+# -----------------------------
+# Fetch Engine Configuration
+# -----------------------------
+
+TMDB_FETCH_WORKERS = 8  # concurrent page requests
+TMDB_RATE_LIMIT = 40.0  # requests per second shared by all workers (TMDB allows ~50/s)
+TMDB_RATE_BURST = 20  # token bucket capacity
+TMDB_BACKOFF_MAX = 10.0  # longest pause after repeated 429s (seconds)
+TMDB_MAX_RATE_LIMIT_RETRIES = 20
+
+# Partitioned crawl: split discover into release-date windows x vote-count bands
+# so every partition fits under MAX_TMDB_PAGES, lifting the ~10k movie cap.
+TMDB_PARTITIONED_CRAWL = True
+TMDB_VOTE_COUNT_BANDS = (10, 50, 200, 1000)  # lower bounds of each band
+
+# -----------------------------
+# HTTP Client Configuration
+# -----------------------------
+
+TMDB_CONNECT_TIMEOUT = 5  # seconds
+TMDB_READ_TIMEOUT = 20  # seconds
+TMDB_HTTP_RETRIES = 3  # retries on connection errors and 5xx responses
+TMDB_HTTP_BACKOFF = 0.5  # exponential backoff factor between retries (seconds)
+
+# Persistent raw-response cache (survives restarts; revalidated with ETag / Last-Modified)
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_FILE = ".tmdb_cache/responses.sqlite"
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024  # LRU eviction above this size
+
+# -----------------------------
+# Detail Enrichment Configuration
+# -----------------------------
+
+# Fetch /movie/{id} (with credits and keywords) for runtime, budget, revenue, director, cast
+ENRICH_MOVIE_DETAILS = True
+ENRICHMENT_APPEND = "credits,keywords"
+ENRICHMENT_MAX_AGE_DAYS = 30  # re-enrich movies whose details are older than this
+ENRICHMENT_TOP_CAST = 5
+
 # -----------------------------
 # Caching Configuration
 # -----------------------------
@@ -23,12 +65,65 @@ DEFAULT_FETCH_PAGES = 500
 TMDB_CACHE_TTL = 86400  # 24 hours
 GENRE_CACHE_TTL = 86400  # 24 hours
 LANGUAGE_CACHE_TTL = 86400  # 24 hours
+FILTER_CACHE_SIZE = 256  # filter results (row indices) memoized per dataset version + filters
+FILTER_CACHE_BYTES = 64 * 2**20  # and at most this many bytes of them per process
+SORT_CACHE_BYTES = 64 * 2**20  # Browse All sort permutations memoized per process
 
 # -----------------------------
 # File Configuration
 # -----------------------------
 
-CSV_DATA_FILE = "tmdb_movies_data.csv"
+SNAPSHOT_DIR = "snapshots"  # versioned prepared datasets + manifest.json
+SNAPSHOT_KEEP_VERSIONS = 3  # older version directories are deleted after a publish
+SNAPSHOT_PRUNE_GRACE = 3600  # seconds a superseded version stays on disk for processes still serving it
+SNAPSHOT_FILE = "tmdb_movies_data.parquet"  # pre-versioning snapshot, read if no manifest exists
+CSV_DATA_FILE = "tmdb_movies_data.csv"  # CSV export / legacy snapshot
+SYNC_STATE_FILE = "tmdb_sync_state.json"
+INGEST_JOURNAL_DIR = ".ingest_runs"  # per-run page journals for resumable crawls
+INGEST_JOURNAL_MAX_AGE = 86400  # older journals are discarded instead of resumed
+
+# -----------------------------
+# Query Backend Configuration
+# -----------------------------
+
+# Browse All filtering / search / sort / paging: "pandas" (in memory), or an embedded
+# SQL store built with each snapshot: "sqlite" (stdlib) or "duckdb" (if installed)
+QUERY_BACKEND = "pandas"
+
+# -----------------------------
+# Memory Budget Configuration
+# -----------------------------
+
+# Memory-budget mode: prepare_df stores float32 scores, small ints and categorical
+# strings (see data_processing.COMPACT_DTYPES). Applies to snapshots built afterwards.
+COMPACT_DTYPES = True
+
+# -----------------------------
+# Search Configuration
+# -----------------------------
+
+# Title search adds typo-tolerant matches when fewer titles than this contain the query
+SEARCH_FUZZY_BELOW = 10
+SEARCH_FUZZY_CANDIDATES = 200  # titles sharing the most trigrams, scored by edit distance
+
+# -----------------------------
+# Delta Sync Configuration
+# -----------------------------
+
+DELTA_MAX_WINDOW_DAYS = 14  # TMDB's changes feed only covers the last 14 days
+DELTA_NEW_RELEASE_LOOKBACK_DAYS = 30  # recent releases re-checked for newly qualifying movies
+
+# -----------------------------
+# Background Refresh Configuration
+# -----------------------------
+
+# False when ingestion runs out of process (cron / sidecar: python -m utils.ingest);
+# the web app then only reads the persisted snapshot and never calls TMDB itself.
+WEB_APP_INGESTION = True
+
+# Snapshots older than this are served as-is while a background refresh runs
+SNAPSHOT_MAX_AGE = TMDB_CACHE_TTL
+REFRESH_POLL_SECONDS = 2  # status poll interval while the first snapshot is being built
 
 # -----------------------------
 # UI Defaults
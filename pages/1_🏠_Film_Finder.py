@@ -2,7 +2,7 @@ import streamlit as st
 
 st.set_page_config(page_title="Hidden Gems", layout="wide", page_icon="🏠")
 
-from utils.data_loader import get_data
+from utils.data_loader import get_data, dataset_key
 from utils.filters import render_sidebar_filters
 from utils.data_processing import filter_df
 from utils.rendering import render_metrics, render_table_and_details
@@ -25,7 +25,7 @@ st.markdown("Discover movies with high ratings but low popularity - the hidden g
 filters = render_sidebar_filters(df)
 
 # Apply filters
-df_filtered = filter_df(df, filters)
+df_filtered = filter_df(df, filters, dataset_key(df))
 
 # Main content
 st.divider()
@@ -4,7 +4,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 st.set_page_config(page_title="Analytics", layout="wide", page_icon="📊")
 
-from utils.data_loader import get_data
+from utils.data_loader import get_data, dataset_key
 from utils.filters import render_sidebar_filters
 from utils.data_processing import filter_df
 from utils.rendering import render_metrics
@@ -27,7 +27,7 @@ st.markdown("Explore detailed analytics and visualizations of TMDB movie data")
 filters = render_sidebar_filters(df)
 
 # Apply filters
-df_filtered = filter_df(df, filters)
+df_filtered = filter_df(df, filters, dataset_key(df))
 
 if len(df_filtered) == 0:
     st.warning("No movies match your filters. Adjust filters to see analytics.")
@@ -132,6 +132,58 @@ ax.grid(True, alpha=0.3, axis='x')
 st.pyplot(fig)
 plt.close()
 
+# Runtime, budget and revenue (only present once movie details are enriched)
+if 'runtime' in df_filtered.columns and df_filtered['runtime'].notna().any():
+    st.divider()
+    st.subheader("🎞️ Runtime, Budget & Revenue")
+    col5, col6 = st.columns(2)
+
+    with col5:
+        runtimes = df_filtered['runtime'].dropna().astype(float)
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.hist(runtimes, bins=30, edgecolor='black', color='plum')
+        ax.axvline(runtimes.median(), color='red', linestyle='--',
+                   label=f'Median: {runtimes.median():.0f} min')
+        ax.set_xlabel('Runtime (minutes)')
+        ax.set_ylabel('Frequency')
+        ax.set_title('Distribution of Runtime')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        st.pyplot(fig)
+        plt.close()
+
+    with col6:
+        money = df_filtered[['budget', 'revenue', 'gems_score']].dropna()
+        fig, ax = plt.subplots(figsize=(10, 6))
+        if len(money) > 0:
+            scatter = ax.scatter(money['budget'].astype(float), money['revenue'].astype(float),
+                                 c=money['gems_score'].astype(float), cmap='viridis',
+                                 alpha=0.6, s=50)
+            ax.set_xscale('log')
+            ax.set_yscale('log')
+            plt.colorbar(scatter, ax=ax, label='Gems Score')
+        ax.set_xlabel('Budget (USD)')
+        ax.set_ylabel('Revenue (USD)')
+        ax.set_title(f'Budget vs Revenue ({len(money):,} movies with both known)')
+        ax.grid(True, alpha=0.3)
+        st.pyplot(fig)
+        plt.close()
+
+    if df_filtered['director'].notna().any():
+        st.subheader("🎬 Top Directors")
+        director_counts = (
+            df_filtered['director'].dropna().str.split(', ').explode().value_counts().head(15)
+        )
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.barh(director_counts.index[::-1], director_counts.values[::-1],
+                color='teal', edgecolor='black')
+        ax.set_xlabel('Number of Movies')
+        ax.set_ylabel('Director')
+        ax.set_title('Top 15 Directors by Movie Count')
+        ax.grid(True, alpha=0.3, axis='x')
+        st.pyplot(fig)
+        plt.close()
+
 st.divider()
 
 # Statistical Summary
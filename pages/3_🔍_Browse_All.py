@@ -3,10 +3,18 @@ import pandas as pd
 from datetime import datetime
 
 st.set_page_config(page_title="Browse All", layout="wide", page_icon="🔍")
-from utils.data_loader import get_data
+from utils.data_loader import get_data, current_snapshot_version, dataset_key
 from utils.filters import render_sidebar_filters
-from utils.data_processing import filter_df
+from utils.data_processing import browse_rows, filter_rows
+from utils.sql_store import (
+    build_sql_store,
+    count_movies,
+    get_backend,
+    query_movies_page,
+    store_exists,
+)
 from utils.rendering import render_cards
+from utils.text_store import attach_texts
 from utils.fonts import apply_moviever_fonts
 import config
 
@@ -26,10 +34,22 @@ st.markdown("Browse and search through all TMDB movies")
 # Sidebar filters
 filters = render_sidebar_filters(df)
 
+# SQL backend: filters, search, sort and paging run in the embedded store
+# (each snapshot version has its own store)
+version = current_snapshot_version()
+use_sql = get_backend() != "pandas" and version is not None
+if use_sql and not store_exists(version):
+    with st.spinner("Building query store..."):
+        use_sql = build_sql_store(df, version)
+
 # Apply filters
-df_filtered = filter_df(df, filters)
+key = dataset_key(df)
+if use_sql:
+    match_count = count_movies(version, filters)
+else:
+    match_count = len(filter_rows(df, filters, key))
 
-if len(df_filtered) == 0:
+if match_count == 0:
     st.warning("No movies match your filters. Adjust filters to see movies.")
     st.stop()
 
@@ -38,27 +58,26 @@ st.divider()
 col1, col2, col3 = st.columns([2, 1, 1])
 
 with col1:
-    search_query = st.text_input("🔍 Search movies by title:", "")
+    search_mode = st.radio("Search in:", ["Title", "Plot"], horizontal=True)
+    if search_mode == "Plot":
+        search_query = st.text_input(
+            "🔍 Search movies by plot:", "", placeholder="e.g. a heist in Tokyo"
+        )
+    else:
+        search_query = st.text_input("🔍 Search movies by title:", "")
 
 with col2:
     sort_by = st.selectbox(
         "Sort by:",
-        ["Gems Score", "Rating", "Popularity", "Vote Count", "Release Date", "Title"],
+        ["Relevance", "Gems Score", "Rating", "Popularity", "Vote Count", "Release Date", "Title"],
     )
 
 with col3:
     sort_order = st.selectbox("Order:", ["Descending", "Ascending"])
 
-# Apply search
-if search_query:
-    df_display = df_filtered[
-        df_filtered["original_title"].str.contains(search_query, case=False, na=False)
-    ]
-else:
-    df_display = df_filtered.copy()
-
 # Apply sorting
 sort_columns = {
+    "Relevance": "relevance",  # search rank; Gems Score (descending) without a search
     "Gems Score": "gems_score",
     "Rating": "vote_average",
     "Popularity": "popularity",
@@ -68,14 +87,27 @@ sort_columns = {
 }
 
 ascending = sort_order == "Ascending"
-df_display = df_display.sort_values(sort_columns[sort_by], ascending=ascending)
-
-# Format for display
-df_display = df_display.copy()
-df_display["release_date_str"] = (
-    df_display["release_date"].dt.strftime("%Y-%m-%d").fillna("N/A")
-)
-# genres_str is already created in prepare_df(), no need to recreate
+# Plot search runs on the snapshot's overview index, so it uses the in-memory path
+if search_mode == "Plot" and search_query:
+    use_sql = False
+if use_sql and sort_columns[sort_by] == "relevance":
+    # The SQL store matches titles with LIKE and has no ranking
+    sort_columns["Relevance"], ascending = "gems_score", False
+
+if not use_sql:
+    # Filter + search mask applied to the dataset's precomputed sort order (memoized),
+    # so changing pages only slices this array. Title search is typo-tolerant; its
+    # index is built on the first search of each dataset version.
+    with st.spinner("Searching..."):
+        display_rows = browse_rows(
+            df,
+            filters,
+            search_query,
+            sort_columns[sort_by],
+            ascending,
+            key,
+            search_mode=search_mode.lower(),
+        )
 
 # Display options
 st.divider()
@@ -86,7 +118,7 @@ with col1:
     items_per_page = st.slider("Items per page:", 10, 100, 25, 10)
 
 # Pagination
-total_items = len(df_display)
+total_items = count_movies(version, filters, search_query) if use_sql else len(display_rows)
 total_pages = (total_items - 1) // items_per_page + 1 if total_items > 0 else 1
 
 if "current_page" not in st.session_state:
@@ -105,7 +137,24 @@ with col2:
 
 start_idx = (page_num - 1) * items_per_page
 end_idx = min(start_idx + items_per_page, total_items)
-df_page = df_display.iloc[start_idx:end_idx]
+if use_sql:
+    df_page = query_movies_page(
+        version,
+        filters,
+        search_query,
+        sort_columns[sort_by],
+        ascending,
+        limit=items_per_page,
+        offset=start_idx,
+    )
+else:
+    df_page = df.iloc[display_rows[start_idx:end_idx]].copy()
+# Heavy text columns live in the snapshot's side store; fetch them for this page only
+df_page = attach_texts(df_page, version)
+
+# Format for display
+df_page["release_date_str"] = df_page["release_date"].dt.strftime("%Y-%m-%d").fillna("N/A")
+# genres_str is already created in prepare_df(), no need to recreate
 
 st.info(f"Showing {start_idx + 1}-{end_idx} of {total_items} movies")
 
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.overview_search import OverviewIndex, build_overview_index
+
+OVERVIEWS = [
+    "A detective hunts a ghost in Tokyo.",
+    None,
+    "Two thieves plan one last heist.",
+    "The ghost of a détective haunts an island.",
+    "",
+]
+
+
+def _index(overviews: pd.Series) -> OverviewIndex:
+    return OverviewIndex(build_overview_index(overviews))
+
+
+@pytest.fixture(params=["object", "str"])
+def chunked(request) -> pd.Series:
+    """The overviews split across several chunks, as the delta-sync upsert leaves them."""
+    parts = [pd.Series(OVERVIEWS[:2], dtype=request.param), pd.Series(OVERVIEWS[2:], dtype=request.param)]
+    return pd.concat(parts, ignore_index=True)
+
+
+def test_multi_chunk_input_matches_single_chunk(chunked):
+    expected = build_overview_index(pd.Series(OVERVIEWS, dtype=object))
+    assert build_overview_index(chunked).equals(expected)
+
+
+def test_search_ranks_rows_sharing_query_terms(chunked):
+    index = _index(chunked)
+    assert index.num_rows == len(OVERVIEWS)
+
+    rows, scores = index.search("ghost detective")
+    assert sorted(rows.tolist()) == [0, 3]
+    assert np.all(np.diff(scores) <= 0)
+
+    rows, _ = index.search("Heist")
+    assert rows.tolist() == [2]
+
+
+def test_search_unranked_and_no_match(chunked):
+    index = _index(chunked)
+    rows, _ = index.search("ghost", ranked=False)
+    assert rows.tolist() == [0, 3]
+
+    rows, scores = index.search("the of a")  # stopwords only
+    assert len(rows) == 0 and len(scores) == 0
+    rows, _ = index.search("submarine")
+    assert len(rows) == 0
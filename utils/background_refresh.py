@@ -0,0 +1,171 @@
+"""
+Background dataset refresher (stale-while-revalidate).
+Rebuilds the prepared dataset off the render path and swaps it in atomically,
+so page renders always serve the current snapshot and never wait on TMDB.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import NamedTuple
+import pandas as pd
+from utils.snapshot_persistence import (
+    load_snapshot,
+    map_snapshot,
+    publish_snapshot,
+    read_manifest,
+)
+from utils.data_processing import dataset_facets
+from utils.delta_sync import save_last_sync
+from utils.ingest import ingest
+
+
+class Snapshot(NamedTuple):
+    """
+    An immutable published dataset, the time it was built, and its filter facets.
+    df is shared by every session and must be treated as read-only.
+    """
+
+    df: pd.DataFrame
+    built_at: datetime
+    version: str | None = None  # manifest version; None if not (yet) persisted
+    facets: dict | None = None  # dataset_facets(df), computed once at publish
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was built."""
+        return (datetime.now(timezone.utc) - self.built_at).total_seconds()
+
+
+def format_age(seconds: float) -> str:
+    if seconds < 90:
+        return "just now"
+    if seconds < 90 * 60:
+        return f"{seconds / 60:.0f} min"
+    if seconds < 36 * 3600:
+        return f"{seconds / 3600:.0f} h"
+    return f"{seconds / 86400:.0f} days"
+
+
+class DatasetRefresher:
+    """
+    Holds the process-wide current snapshot and runs at most one refresh thread.
+    Readers only ever see a complete snapshot: the new one replaces the old
+    in a single reference swap once it is fully built and persisted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._thread = None
+        self._last_started = None
+        self.status = ""
+        self.progress = 0.0
+        self.last_error = None
+        self.last_stats = None
+
+    @property
+    def snapshot(self) -> Snapshot | None:
+        return self._snapshot
+
+    @property
+    def refreshing(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def seconds_since_start(self) -> float | None:
+        if self._last_started is None:
+            return None
+        return time.monotonic() - self._last_started
+
+    def publish(
+        self, df: pd.DataFrame, built_at: datetime | None = None, version: str | None = None
+    ) -> Snapshot:
+        """Atomically make df the current snapshot (computing its facets first)."""
+        snapshot = Snapshot(
+            df, built_at or datetime.now(timezone.utc), version, dataset_facets(df)
+        )
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def start(self, full: bool = False) -> bool:
+        """
+        Start a background refresh unless one is already running.
+        Incremental (delta sync) when a snapshot exists, full rebuild otherwise or if full=True.
+        """
+        with self._lock:
+            if self.refreshing:
+                return False
+            self._last_started = time.monotonic()
+            self.status = "Starting refresh..."
+            self.progress = 0.0
+            self.last_error = None
+            self._thread = threading.Thread(
+                target=self._run, args=(full,), name="dataset-refresh", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def start_if_stale(self, max_age: float) -> bool:
+        """Refresh a snapshot older than max_age, at most one attempt per max_age window."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.age <= max_age:
+            return False
+        since = self.seconds_since_start()
+        if since is not None and since < max_age:
+            return False
+        return self.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the running refresh finishes. Returns False on timeout."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.refreshing
+
+    # --- runs on the refresh thread (no Streamlit calls here) --------------
+
+    def _run(self, full: bool) -> None:
+        try:
+            snapshot = self._snapshot
+            # The served frame lacks the side-store text columns; the Parquet file is complete
+            manifest = read_manifest()
+            base = None if manifest is None else load_snapshot(manifest=manifest)
+            if base is None and snapshot is not None:
+                base = snapshot.df
+            # Builds a new frame; the published snapshot is never touched
+            df, self.last_stats, fetch_started = ingest(base, full=full, report=self._report)
+            self.status = "Saving snapshot..."
+            manifest = publish_snapshot(df)
+            if manifest is None:
+                # Served from memory only: keep the watermark so the next run re-fetches
+                self.publish(df)
+            else:
+                save_last_sync(fetch_started)
+                # Serve the shared mapping rather than this thread's private copy
+                mapped = map_snapshot(manifest)
+                self.publish(
+                    df if mapped is None else mapped,
+                    datetime.fromisoformat(manifest["built_at"]),
+                    manifest["version"],
+                )
+            self.status = f"Refreshed {len(df):,} movies"
+        except Exception as e:
+            self.last_error = str(e)
+            self.status = ""
+        finally:
+            self.progress = 1.0
+
+    def _report(self, status: str, progress: float | None):
+        self.status = status
+        if progress is not None:
+            self.progress = progress
+
+
+# One refresher per server process, shared by every session
+_refresher = DatasetRefresher()
+
+
+def get_refresher() -> DatasetRefresher:
+    return _refresher
@@ -0,0 +1,80 @@
+"""
+Streaming columnar ingestion: turn each TMDB results page into typed column
+chunks as it arrives and build the DataFrame once at the end.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Discover fields the app reads, with the dtype each is stored as.
+# Everything else in the payload (backdrop_path, video, ...) is dropped on arrival.
+MOVIE_COLUMNS = {
+    "id": np.int64,
+    "title": object,
+    "original_title": object,
+    "overview": object,
+    "release_date": object,
+    "original_language": object,
+    "genre_ids": object,
+    "poster_path": object,
+    "adult": np.bool_,
+    "vote_average": np.float64,
+    "vote_count": np.int64,
+    "popularity": np.float64,
+}
+
+# Value used when a field is missing or null in the payload
+_MISSING = {np.int64: 0, np.float64: np.nan, np.bool_: False, object: None}
+
+
+class ColumnBuilder:
+    """
+    Accumulates results pages as typed numpy chunks, deduplicated by id.
+    Chunks are concatenated once in to_frame(), ordered by the position given to add().
+    """
+
+    def __init__(self, columns: dict = MOVIE_COLUMNS):
+        self.columns = columns
+        self._chunks = []  # (position, {column: ndarray})
+        self._seen_ids = set()
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def add(self, results: list[dict], position: int | None = None) -> None:
+        """Convert one page of result dicts to column chunks. The dicts can then be freed."""
+        results = [m for m in results if m["id"] not in self._seen_ids]
+        if not results:
+            return
+        self._seen_ids.update(m["id"] for m in results)
+
+        chunk = {}
+        for name, dtype in self.columns.items():
+            missing = _MISSING[dtype]
+            values = [m.get(name, missing) for m in results]
+            if dtype is object:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values  # keeps lists (genre_ids) as single elements
+            else:
+                column = np.array(
+                    [missing if v is None else v for v in values], dtype=dtype
+                )
+            chunk[name] = column
+
+        self._chunks.append((len(self._chunks) if position is None else position, chunk))
+        self._rows += len(results)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Concatenate every chunk once into the final DataFrame."""
+        ordered = [chunk for _, chunk in sorted(self._chunks, key=lambda c: c[0])]
+        if not ordered:
+            return pd.DataFrame(
+                {name: np.empty(0, dtype=dtype) for name, dtype in self.columns.items()}
+            )
+        data = {
+            name: np.concatenate([chunk[name] for chunk in ordered])
+            for name in self.columns
+        }
+        self._chunks = []
+        return pd.DataFrame(data, copy=False)
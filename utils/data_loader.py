@@ -1,136 +1,134 @@
 """
-Main data loading function with CSV persistence and TMDB fetching.
+Main data loading function: serves the process-wide snapshot and keeps it
+fresh with background refreshes (stale-while-revalidate).
 """
 
 import streamlit as st
 import pandas as pd
+import os
 import time
+from datetime import datetime
 import config
-from utils.tmdb_api import fetch_tmdb_page, fetch_tmdb_all_pages
-from utils.data_processing import prepare_df
-from utils.csv_persistence import save_data_to_csv, load_data_from_csv
+from utils.data_processing import dataset_facets
+from utils.schema import SCHEMA_VERSION
+from utils.snapshot_persistence import (
+    MANIFEST_FILE,
+    map_snapshot,
+    read_manifest,
+    upgrade_snapshot,
+)
+from utils.background_refresh import get_refresher
+
+
+# (mtime_ns, manifest) of the last manifest read
+_manifest_cache = (None, None)
+
+
+def _current_manifest() -> dict | None:
+    global _manifest_cache
+    try:
+        mtime = os.stat(os.path.join(config.SNAPSHOT_DIR, MANIFEST_FILE)).st_mtime_ns
+    except OSError:
+        return None
+    cached_mtime, manifest = _manifest_cache
+    if mtime != cached_mtime:
+        manifest = read_manifest()
+        _manifest_cache = (mtime, manifest)
+    return manifest
 
 
 def get_data() -> pd.DataFrame | None:
     """
-    Multipage-safe loader with CSV persistence.
-    - First checks session_state (fastest)
-    - Then checks CSV file (fast, no API calls)
-    - Finally fetches from TMDB (slow, with progress)
-    - Saves to CSV after fetching from TMDB
-    - Stores prepared df in session_state so switching pages does NOT refetch.
+    Multipage-safe, non-blocking loader.
+    - Serves the current prepared snapshot, shared by all sessions (instant)
+    - Maps the current snapshot version on first use, and again whenever another
+      process (python -m utils.ingest) has published a newer one (no API calls)
+    - Never touches the network or re-derives columns: older schemas are migrated
+      offline and republished once
+    - A rerun does no dataset work at all: the frame (and its facets, see get_facets)
+      is built once per snapshot version and held process-wide, never per session
+    - With WEB_APP_INGESTION, stale or missing snapshots are rebuilt by a background
+      thread; the render never waits on TMDB and the new snapshot is swapped in when complete
     """
-    session_key = "tmdb_prepared_data"
-
-    # First: Check session state (fastest, no I/O)
-    if session_key in st.session_state:
-        cached = st.session_state.get(session_key)
-        if isinstance(cached, pd.DataFrame) and len(cached) > 0:
-            return prepare_df(cached)
-
-    # Second: Check CSV file (fast, no API calls)
-    csv_data = load_data_from_csv()
-    if csv_data is not None and len(csv_data) > 0:
-        st.session_state[session_key] = csv_data
-        st.session_state.tmdb_show_progress = False
-        # Show info only once per session
-        if "csv_loaded_notified" not in st.session_state:
-            st.info(
-                f"📁 Loaded {len(csv_data):,} movies from CSV cache. Use 'Refresh Data' to fetch fresh data from TMDB."
-            )
-            st.session_state.csv_loaded_notified = True
-        return prepare_df(csv_data)
-
-    # Third: Fetch from TMDB (slow, with progress)
-    # show progress only on first load in this session
-    st.session_state.setdefault("tmdb_show_progress", True)
-    show_progress = st.session_state.tmdb_show_progress
+    refresher = get_refresher()
+    snapshot = refresher.snapshot
+
+    # O(1) change check: one stat, plus a small manifest read when it changed
+    manifest = _current_manifest()
+    if manifest is None or manifest["schema_version"] != SCHEMA_VERSION:
+        # Unversioned or older data on disk: migrated offline and republished once
+        manifest = upgrade_snapshot()
+    if manifest is not None:
+        built_at = datetime.fromisoformat(manifest["built_at"])
+        if snapshot is None or (
+            manifest["version"] != snapshot.version and built_at > snapshot.built_at
+        ):
+            # Stored already prepared, and mapped zero-copy: every session and every
+            # server process on the host shares the same pages
+            df = map_snapshot(manifest)
+            if df is not None:
+                snapshot = refresher.publish(df, built_at, manifest["version"])
+
+    if snapshot is None:
+        return _wait_for_first_snapshot(refresher)
+
+    if config.WEB_APP_INGESTION:
+        refresher.start_if_stale(config.SNAPSHOT_MAX_AGE)
+    return snapshot.df
+
+
+def _wait_for_first_snapshot(refresher) -> None:
+    """No data at all yet: start the build in the background and poll its status."""
+    if not config.WEB_APP_INGESTION:
+        st.error(
+            f"No movie snapshot found in {config.SNAPSHOT_DIR}/. "
+            "Run `python -m utils.ingest` to build it."
+        )
+        return None
 
-    try:
-        if show_progress:
-            progress_placeholder = st.empty()
-            status_placeholder = st.empty()
-            progress_bar = progress_placeholder.progress(0.0)
-            status_text = status_placeholder.empty()
-
-            max_pages = config.DEFAULT_FETCH_PAGES
-
-            all_movies = []
-            total_pages_known = None
-
-            backoff = 1.0
-            backoff_max = 10.0
-
-            for page in range(1, max_pages + 1):
-                # Fetch page (cached) with backoff on 429
-                while True:
-                    data = fetch_tmdb_page(page)
-                    if isinstance(data, dict) and data.get("_rate_limited"):
-                        status_text.warning(
-                            f"⏳ Rate limited. Waiting {backoff:.0f}s..."
-                        )
-                        time.sleep(backoff)
-                        backoff = min(backoff * 2, backoff_max)
-                        continue
-                    backoff = 1.0
-                    break
-
-                if total_pages_known is None:
-                    total_pages_known = min(
-                        data.get("total_pages", max_pages), max_pages
-                    )
-
-                movies = data.get("results", [])
-                if not movies:
-                    break
-
-                all_movies.extend(movies)
-
-                # Update UI (lightweight)
-                progress_bar.progress(min(1.0, page / max(total_pages_known, 1)))
-                status_text.text(
-                    f"📥 Page {page}/{total_pages_known} | movies {len(all_movies):,}"
-                )
-
-                if page >= total_pages_known:
-                    break
-
-            progress_bar.progress(1.0)
-            status_text.text(f"✅ Complete! Fetched {len(all_movies):,} movies.")
-            time.sleep(0.5)
-            progress_placeholder.empty()
-            status_placeholder.empty()
-
-            if not all_movies:
-                st.error("No movies fetched. Please check your API token.")
-                return None
-
-            df_prepared = prepare_df(pd.DataFrame(all_movies))
-
-            # Save to CSV after fetching
-            if save_data_to_csv(df_prepared):
-                st.success(
-                    f"💾 Saved {len(df_prepared):,} movies to {config.CSV_DATA_FILE}"
-                )
-
-            st.session_state[session_key] = df_prepared
-            st.session_state.tmdb_show_progress = False
-            return df_prepared
-
-        # Subsequent loads in same session: full fetch via cached all-pages
-        df_raw = fetch_tmdb_all_pages(max_pages=config.MAX_TMDB_PAGES)
-        df_prepared = prepare_df(df_raw)
-
-        # Save to CSV after fetching
-        if save_data_to_csv(df_prepared):
-            st.success(
-                f"💾 Saved {len(df_prepared):,} movies to {config.CSV_DATA_FILE}"
-            )
-
-        st.session_state[session_key] = df_prepared
-        st.session_state.tmdb_show_progress = False
-        return df_prepared
-
-    except Exception as e:
-        st.error(f"Failed to load data: {e}")
+    if refresher.last_error and not refresher.refreshing:
+        st.error(f"Failed to load data: {refresher.last_error}")
+        if st.button("🔄 Retry"):
+            refresher.start()
+            st.rerun()
+        return None
+
+    refresher.start()
+    st.info("🏗️ Building the movie dataset from TMDB in the background...")
+    st.progress(refresher.progress)
+    st.caption(refresher.status)
+    time.sleep(config.REFRESH_POLL_SECONDS)
+    st.rerun()
+
+
+def get_facets(df: pd.DataFrame) -> dict:
+    """Filter facets of a frame returned by get_data: precomputed for the current snapshot."""
+    snapshot = get_refresher().snapshot
+    if snapshot is not None and snapshot.df is df:
+        return snapshot.facets
+    # The snapshot was swapped since df was served
+    return dataset_facets(df)
+
+
+def dataset_key(df: pd.DataFrame) -> str | None:
+    """
+    Key identifying the immutable snapshot df was served from (for cross-session memos),
+    or None if df is not the current snapshot's frame.
+    """
+    snapshot = get_refresher().snapshot
+    if snapshot is None or snapshot.df is not df:
         return None
+    return snapshot.version or snapshot.built_at.isoformat()
+
+
+def current_snapshot_version() -> str | None:
+    """Manifest version of the snapshot get_data serves (None if it isn't persisted)."""
+    snapshot = get_refresher().snapshot
+    return None if snapshot is None else snapshot.version
+
+
+def request_refresh(full: bool = False) -> bool:
+    """Start a background refresh (delta sync unless full). False if one is already running."""
+    if not config.WEB_APP_INGESTION:
+        return False
+    return get_refresher().start(full=full)
@@ -2,15 +2,135 @@
 Data processing functions for preparing and filtering movie data.
 """
 
+import logging
 import pandas as pd
 import numpy as np
-from utils.genre import fetch_genre_map
-from utils.tmdb_api import fetch_tmdb_lang_codes
+import config
+from utils.enrichment import ENRICHMENT_COLUMNS
+from utils.genre import fetch_genre_map, genre_mask, genre_names_mask, offline_genre_map
+from utils.memo import LRUCache
+from utils.overview_search import overview_index
+from utils.text_store import attach_texts
+from utils.title_search import title_index
+from utils.tmdb_api import fetch_tmdb_lang_codes, offline_language_names
 
+logger = logging.getLogger(__name__)
 
-def prepare_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Parse dates, add year, add gems_score, map genre IDs to names."""
-    df = df.copy()
+
+# Raw TMDB fields the app reads; anything else a legacy snapshot carries
+# (backdrop_path, video, ...) is dropped by compact_df
+RAW_COLUMNS = [
+    "id", "title", "original_title", "overview", "release_date", "original_language",
+    "genre_ids", "poster_path", "adult", "vote_average", "vote_count", "popularity",
+]
+
+# Derived columns added by prepare_df
+PREPARED_COLUMNS = [
+    "year", "gems_score", "genres", "genres_str", "genre_mask", "original_language_name",
+]
+
+# Narrow dtypes used in memory-budget mode (config.COMPACT_DTYPES).
+# Low-cardinality strings become categoricals (one copy of each distinct value).
+COMPACT_DTYPES = {
+    "vote_average": "float32",
+    "popularity": "float32",
+    "gems_score": "float32",
+    "vote_count": "int32",
+    "year": "Int16",
+    "original_language": "category",
+    "original_language_name": "category",
+    "genres_str": "category",
+}
+
+
+def compact_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop raw fields the app never reads and, with COMPACT_DTYPES, narrow numeric
+    columns and turn low-cardinality strings into categoricals. Modifies df's columns
+    in place (the caller owns df) and returns it.
+    """
+    unused = [
+        c for c in df.columns
+        if c not in RAW_COLUMNS and c not in PREPARED_COLUMNS and c not in ENRICHMENT_COLUMNS
+    ]
+    if unused:
+        df = df.drop(columns=unused)
+
+    if config.COMPACT_DTYPES:
+        for column, dtype in COMPACT_DTYPES.items():
+            if column in df.columns and df[column].dtype != dtype:
+                df[column] = df[column].astype(dtype)
+    return df
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Per-column dtype and deep memory use (MB) of two versions of a frame, with the savings."""
+    mb_before = before.memory_usage(index=False, deep=True) / 1e6
+    mb_after = after.memory_usage(index=False, deep=True).reindex(mb_before.index) / 1e6
+    report = pd.DataFrame(
+        {
+            "dtype_before": before.dtypes.astype(str),
+            "dtype_after": after.dtypes.reindex(mb_before.index).astype(str),
+            "mb_before": mb_before,
+            "mb_after": mb_after.fillna(0),
+        }
+    )
+    report.loc["TOTAL"] = ["", "", mb_before.sum(), report["mb_after"].sum()]
+    report["saved_pct"] = (1 - report["mb_after"] / report["mb_before"]) * 100
+    return report.round(2)
+
+
+def map_genres(
+    genre_ids: pd.Series, genre_map: dict[int, str]
+) -> tuple[list, np.ndarray, pd.Categorical, np.ndarray]:
+    """
+    Genre columns for a genre_ids column: (genre_ids, genres, genres_str, genre_mask).
+    Rows are factorized by their id combination (a few thousand distinct at most), names,
+    strings and masks are built once per combination and broadcast back with take.
+    Unknown ids map to "Unknown"; missing id lists become empty lists.
+    """
+    ids = [tuple(x) if isinstance(x, (list, tuple, np.ndarray)) else () for x in genre_ids]
+    codes, combos = pd.factorize(pd.Series(ids, dtype=object))
+
+    combo_ids = np.empty(len(combos), dtype=object)
+    combo_names = np.empty(len(combos), dtype=object)
+    for i, combo in enumerate(combos):
+        combo_ids[i] = list(combo)
+        combo_names[i] = [genre_map.get(gid, "Unknown") for gid in combo]
+    combo_strs = [", ".join(names) if names else "Unknown" for names in combo_names]
+
+    # Different id combinations can join to the same string ("Unknown")
+    str_codes, strs = pd.factorize(pd.Series(combo_strs, dtype=object))
+    genres_str = pd.Categorical.from_codes(str_codes[codes], categories=strs)
+    masks = genre_mask(pd.Series(combo_ids, dtype=object))
+
+    # Rows with the same combination share one (read-only) list object
+    return list(combo_ids[codes]), list(combo_names[codes]), genres_str, masks[codes]
+
+
+def map_language_names(codes: pd.Series, names: dict[str, str]) -> pd.Categorical:
+    """
+    English names for ISO 639-1 codes, looked up once per distinct code.
+    Codes without a known name fall back to the code itself.
+    """
+    languages = codes.astype("category")
+    categories = languages.cat.categories
+    mapped = categories.map(lambda code: names.get(code, code))
+    name_codes, unique_names = pd.factorize(mapped)
+    # Missing codes (-1) pick the appended -1
+    lookup = np.append(name_codes, -1)
+    return pd.Categorical.from_codes(
+        lookup[languages.cat.codes.to_numpy()], categories=unique_names
+    )
+
+
+def prepare_df(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    """
+    Parse dates, add year, add gems_score, map genre IDs to names and bits, then compact_df.
+    Pass copy=False when the caller owns df (e.g. a freshly fetched frame) to skip the copy.
+    """
+    if copy:
+        df = df.copy()
 
     df["release_date"] = pd.to_datetime(df["release_date"], errors="coerce")
     df["year"] = df["release_date"].dt.year
@@ -20,72 +140,266 @@ def prepare_df(df: pd.DataFrame) -> pd.DataFrame:
     )
     df["gems_score"] = df["gems_score"].fillna(0)
 
-    # Map genre IDs to genre names
-    genre_map = fetch_genre_map()
+    # Map genre IDs to names (list and comma-separated string) and bits
+    genre_map = fetch_genre_map() or offline_genre_map()
+    df["genre_ids"], df["genres"], df["genres_str"], df["genre_mask"] = map_genres(
+        df["genre_ids"], genre_map
+    )
 
-    def map_genre_ids(genre_ids):
-        """Convert list of genre IDs to list of genre names."""
-        if not isinstance(genre_ids, list):
-            return []
-        return [genre_map.get(gid, "Unknown") for gid in genre_ids]
+    # Map language ISO 639-1 tags to names
+    try:
+        lang_names = fetch_tmdb_lang_codes()["english_name"].to_dict()
+    except Exception as e:
+        logger.warning("Failed to fetch language names: %s. Using cached names.", e)
+        lang_names = offline_language_names()
+    df["original_language_name"] = map_language_names(df["original_language"], lang_names)
 
-    # Add genres column (list of genre names)
-    df["genres"] = df["genre_ids"].apply(map_genre_ids)
+    if not config.COMPACT_DTYPES:
+        for column in ("genres_str", "original_language_name"):
+            df[column] = np.asarray(df[column])
+    return compact_df(df)
 
-    # Add genres_str column (comma-separated string)
-    df["genres_str"] = df["genres"].apply(lambda x: ", ".join(x) if x else "Unknown")
 
-    # Map language ISO 639-1 tags to names
-    lang_map = fetch_tmdb_lang_codes()
-    if lang_map is not None:
-        df["original_language_name"] = df["original_language"].map(
-            lambda x: lang_map.loc[x, "english_name"]
-        )
+def dataset_facets(df: pd.DataFrame) -> dict:
+    """
+    What the sidebar filters offer for a prepared frame: year bounds (None if no dates),
+    genre names and language names. Computed once per published snapshot.
+    """
+    years = df["year"].dropna()
+    # Distinct genre combinations (few, and categorical in memory-budget mode)
+    genres = {
+        name for combo in df["genres_str"].dropna().unique() for name in combo.split(", ")
+    }
+    genres.discard("Unknown")
+    return {
+        "min_year": int(years.min()) if len(years) else None,
+        "max_year": int(years.max()) if len(years) else None,
+        "genres": sorted(genres),
+        "languages": sorted(df["original_language_name"].dropna().unique()),
+    }
 
-    return df
 
+def genre_rows(
+    df: pd.DataFrame, include: list[str], match: str = "any", exclude: list[str] = ()
+) -> np.ndarray:
+    """
+    Boolean row mask: rows having any (match="any") or all (match="all") of the include
+    genres and none of the exclude genres. Bitwise on genre_mask; genres without a bit
+    fall back to checking each distinct genres_str once.
+    """
+    include_bits = genre_names_mask(include)
+    exclude_bits = genre_names_mask(exclude)
+    if "genre_mask" in df.columns and include_bits is not None and exclude_bits is not None:
+        masks = df["genre_mask"].to_numpy()
+        rows = np.ones(len(df), dtype=bool)
+        if include_bits:
+            if match == "all":
+                rows &= (masks & include_bits) == include_bits
+            else:
+                rows &= (masks & include_bits) != 0
+        if exclude_bits:
+            rows &= (masks & exclude_bits) == 0
+        return rows
 
-def filter_df(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
-    """Filter DataFrame based on user filters."""
-    df_filtered = df.copy()
+    include, exclude = set(include), set(exclude)
+
+    def matches(genres: list[str]) -> bool:
+        genres = set(genres)
+        if include and not (include <= genres if match == "all" else include & genres):
+            return False
+        return not exclude & genres
+
+    # Served frames carry no genre lists; genres_str has few distinct values
+    combos = df["genres_str"].astype("category")
+    hits = np.array(
+        [matches(combo.split(", ")) for combo in combos.cat.categories], dtype=bool
+    )
+    codes = combos.cat.codes.to_numpy()
+    return np.append(hits, False)[codes]  # missing (-1) never matches
 
-    if not filters["adult"]:
-        df_filtered = df_filtered[df_filtered["adult"] == False]
-
-    # Filter by genre (check if selected genre is in the genres list)
-    if filters["genre"] != "All":
-        if "genres" in df_filtered.columns:
-            df_filtered = df_filtered[
-                df_filtered["genres"].apply(
-                    lambda x: filters["genre"] in x if isinstance(x, list) else False
-                )
-            ]
-        else:
-            # Fallback: filter by genres_str if genres column doesn't exist
-            df_filtered = df_filtered[
-                df_filtered["genres_str"].str.contains(
-                    filters["genre"], case=False, na=False
-                )
-            ]
-
-    # Filter by language
-    if filters["original_language_name"] != "All":
-        if "original_language_name" in df_filtered.columns:
-            df_filtered = df_filtered[
-                df_filtered["original_language_name"]
-                == filters["original_language_name"]
-            ]
 
-    df_filtered = df_filtered[df_filtered["vote_average"] >= filters["min_rating"]]
-    df_filtered = df_filtered[df_filtered["popularity"] <= filters["max_popularity"]]
-    df_filtered = df_filtered[df_filtered["vote_count"] >= filters["min_vote_count"]]
+def normalize_filters(filters: dict) -> tuple:
+    """
+    Hashable form of a sidebar filters dict: equal for filter states that select the
+    same rows (genre order and duplicates, match mode without included genres).
+    """
+    genres = tuple(sorted(set(filters["genres"])))
+    return (
+        bool(filters["adult"]),
+        genres,
+        filters["genre_match"] if len(genres) > 1 else "any",
+        tuple(sorted(set(filters["exclude_genres"]))),
+        filters["original_language_name"],
+        float(filters["min_rating"]),
+        float(filters["max_popularity"]),
+        int(filters["min_vote_count"]),
+        filters["min_year"],
+        filters["max_year"],
+        bool(filters["include_missing_dates"]),
+    )
+
+
+def _matches(condition: pd.Series) -> np.ndarray:
+    # Missing values (nullable year, NaN scores) never match
+    return condition.to_numpy(dtype=bool, na_value=False)
+
 
+def filter_mask(df: pd.DataFrame, filters: dict) -> np.ndarray:
+    """Compile the sidebar filters into one boolean row mask (no intermediate frames)."""
+    mask = np.ones(len(df), dtype=bool)
+    mask &= _matches(df["vote_average"] >= filters["min_rating"])
+    mask &= _matches(df["popularity"] <= filters["max_popularity"])
+    mask &= _matches(df["vote_count"] >= filters["min_vote_count"])
+
+    if not filters["adult"]:
+        mask &= ~df["adult"].to_numpy(dtype=bool)
+    # Genres: any-of / all-of the selected ones, none of the excluded ones
+    if filters["genres"] or filters["exclude_genres"]:
+        mask &= genre_rows(
+            df, filters["genres"], filters["genre_match"], filters["exclude_genres"]
+        )
+    if filters["original_language_name"] != "All":
+        mask &= _matches(df["original_language_name"] == filters["original_language_name"])
     if filters["min_year"] is not None:
-        df_filtered = df_filtered[df_filtered["year"] >= filters["min_year"]]
+        mask &= _matches(df["year"] >= filters["min_year"])
     if filters["max_year"] is not None:
-        df_filtered = df_filtered[df_filtered["year"] <= filters["max_year"]]
-
+        mask &= _matches(df["year"] <= filters["max_year"])
     if not filters["include_missing_dates"]:
-        df_filtered = df_filtered[df_filtered["release_date"].notna()]
+        mask &= df["release_date"].notna().to_numpy()
+    return mask
+
+
+# (dataset key, normalize_filters(...)) -> positions of the matching rows (int32)
+_filter_memo = LRUCache(config.FILTER_CACHE_SIZE, config.FILTER_CACHE_BYTES)
+
+
+def filter_rows(df: pd.DataFrame, filters: dict, key=None) -> np.ndarray:
+    """
+    Positions of the rows matching the filters, in df order (read-only array).
+    key identifies df's immutable dataset version (see data_loader.dataset_key); with it
+    the result is memoized, so the same filters from any session or page are served
+    without evaluating the mask again.
+    """
+    memo_key = None if key is None else (key, normalize_filters(filters))
+    rows = None if memo_key is None else _filter_memo.get(memo_key)
+    if rows is None:
+        # int32 halves the memo's footprint (row counts fit)
+        rows = np.flatnonzero(filter_mask(df, filters)).astype(np.int32)
+        rows.flags.writeable = False
+        if memo_key is not None:
+            _filter_memo.put(memo_key, rows)
+    return rows
+
+
+def filter_df(df: pd.DataFrame, filters: dict, key=None) -> pd.DataFrame:
+    """Filter DataFrame based on user filters (one combined mask, one take; see filter_rows)."""
+    rows = filter_rows(df, filters, key)
+    # Every row matches: the (read-only) dataset itself, no take
+    return df if len(rows) == len(df) else df.iloc[rows]
+
 
-    return df_filtered
+# Columns Browse All sorts by
+SORT_COLUMNS = (
+    "gems_score", "vote_average", "popularity", "vote_count", "release_date", "original_title",
+)
+
+# (dataset key, column, ascending) -> row positions in sort order (int32)
+_sort_memo = LRUCache(
+    2 * len(SORT_COLUMNS) * config.SNAPSHOT_KEEP_VERSIONS, config.SORT_CACHE_BYTES
+)
+
+# (dataset key, filters, search, column, ascending) -> matching positions in sort order (int32)
+_browse_memo = LRUCache(config.FILTER_CACHE_SIZE, config.FILTER_CACHE_BYTES)
+
+
+def sort_order(df: pd.DataFrame, column: str, ascending: bool, key=None) -> np.ndarray:
+    """
+    Row positions of df sorted by column: missing values last in either direction,
+    ties in row order. Computed once per dataset version, column and direction.
+    """
+    memo_key = None if key is None else (key, column, ascending)
+    order = None if memo_key is None else _sort_memo.get(memo_key)
+    if order is None:
+        # Dense ranks (-1 = missing) sort every dtype the same way, strings included
+        ranks, uniques = pd.factorize(df[column], sort=True)
+        ranks = ranks.astype(np.int64)
+        if not ascending:
+            ranks = np.where(ranks >= 0, len(uniques) - 1 - ranks, ranks)
+        ranks[ranks < 0] = len(uniques)
+        order = np.argsort(ranks, kind="stable").astype(np.int32)
+        order.flags.writeable = False
+        if memo_key is not None:
+            _sort_memo.put(memo_key, order)
+    return order
+
+
+def title_matches(df: pd.DataFrame, search: str) -> np.ndarray:
+    """Case-insensitive substring match of search on original_title (literal, not regex)."""
+    return _matches(df["original_title"].str.contains(search, case=False, regex=False))
+
+
+def title_search(df: pd.DataFrame, search: str, key) -> np.ndarray:
+    """
+    Row positions whose original or localized title matches search, best match first
+    (typo-tolerant, via the dataset version's trigram index).
+    """
+    def load_titles():
+        if "title" in df.columns:
+            return df["title"]
+        return attach_texts(df[["id"]], key).get("title")
+
+    return title_index(df, key, load_titles).search(search)
+
+
+def plot_search(df: pd.DataFrame, search: str, key, ranked: bool = True) -> np.ndarray:
+    """Row positions whose overview shares a term with search, by BM25 score if ranked."""
+    rows, _ = overview_index(df, key).search(search, ranked)
+    return rows
+
+
+def browse_rows(
+    df: pd.DataFrame,
+    filters: dict,
+    search: str,
+    column: str,
+    ascending: bool,
+    key=None,
+    search_mode: str = "title",
+) -> np.ndarray:
+    """
+    Positions of the rows matching filters and search, in sort order: the precomputed
+    permutation with the match mask applied. search_mode "title" searches titles,
+    "plot" overviews. column "relevance" orders by search rank (gems_score without a
+    search). Memoized, so paging through the result is a slice of this array.
+    """
+    memo_key = (
+        None
+        if key is None
+        else (key, normalize_filters(filters), search, search_mode, column, ascending)
+    )
+    rows = None if memo_key is None else _browse_memo.get(memo_key)
+    if rows is None:
+        mask = np.zeros(len(df), dtype=bool)
+        mask[filter_rows(df, filters, key)] = True
+        matched = None
+        if search and search_mode == "plot":
+            matched = plot_search(df, search, key, ranked=column == "relevance")
+        elif search and key is not None:
+            matched = title_search(df, search, key)
+        elif search:
+            mask &= title_matches(df, search)
+        if matched is not None:
+            found = np.zeros(len(df), dtype=bool)
+            found[matched] = True
+            mask &= found
+        if column != "relevance":
+            order = sort_order(df, column, ascending, key)
+        elif matched is not None:
+            order = matched  # best match first
+        else:
+            order = sort_order(df, "gems_score", False, key)
+        rows = order[mask[order]].astype(np.int32, copy=False)
+        rows.flags.writeable = False
+        if memo_key is not None:
+            _browse_memo.put(memo_key, rows)
+    return rows
@@ -0,0 +1,151 @@
+"""
+Incremental (delta) refresh: pull only movies changed or added since the last sync
+and upsert them by id into the persisted dataset.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from functools import partial
+import pandas as pd
+import config
+from utils.fetch_engine import fetch_pages, iter_concurrent
+from utils.tmdb_api import (
+    fetch_discover_page,
+    fetch_movie_changes_page,
+    fetch_movie_details,
+)
+from utils.data_processing import compact_df, prepare_df
+from utils.columnar import ColumnBuilder
+
+
+def load_last_sync() -> datetime | None:
+    """
+    Return the last-sync watermark (UTC).
+    Falls back to the CSV file's modification time for datasets saved before watermarks existed.
+    """
+    try:
+        with open(config.SYNC_STATE_FILE, encoding="utf-8") as f:
+            return datetime.fromisoformat(json.load(f)["last_sync"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if os.path.exists(config.CSV_DATA_FILE):
+        return datetime.fromtimestamp(
+            os.path.getmtime(config.CSV_DATA_FILE), tz=timezone.utc
+        )
+    return None
+
+
+def save_last_sync(synced_at: datetime) -> None:
+    """Persist the last-sync watermark."""
+    with open(config.SYNC_STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump({"last_sync": synced_at.isoformat()}, f)
+
+
+def _details_to_discover_row(details: dict) -> dict:
+    """Reshape a /movie/{id} payload into the row format returned by discover."""
+    return {
+        "id": details["id"],
+        "adult": details.get("adult", False),
+        "backdrop_path": details.get("backdrop_path"),
+        "genre_ids": [g["id"] for g in details.get("genres", [])],
+        "original_language": details.get("original_language"),
+        "original_title": details.get("original_title"),
+        "overview": details.get("overview"),
+        "popularity": details.get("popularity"),
+        "poster_path": details.get("poster_path"),
+        "release_date": details.get("release_date"),
+        "title": details.get("title"),
+        "video": details.get("video", False),
+        "vote_average": details.get("vote_average"),
+        "vote_count": details.get("vote_count"),
+    }
+
+
+def _qualifies(row: dict) -> bool:
+    """Same criteria as the discover query used for the full crawl."""
+    release_date = row.get("release_date") or ""
+    return (
+        not row.get("adult")
+        and (row.get("vote_average") or 0) >= config.MIN_VOTE_AVERAGE
+        and (row.get("vote_count") or 0) >= config.MIN_VOTE_COUNT
+        and f"{config.MIN_YEAR}-01-01" <= release_date <= f"{config.MAX_YEAR}-12-31"
+    )
+
+
+def upsert_movies(
+    df: pd.DataFrame, updates: pd.DataFrame, removed_ids=()
+) -> pd.DataFrame:
+    """Replace rows by id with updates, append new ids and drop removed ids."""
+    if len(updates) == 0:
+        return df[~df["id"].isin(set(removed_ids))].reset_index(drop=True)
+
+    drop_ids = set(updates["id"]) | set(removed_ids)
+    # Concatenating categoricals with different categories falls back to object
+    merged = pd.concat([df[~df["id"].isin(drop_ids)], updates], ignore_index=True)
+    return compact_df(merged)
+
+
+def sync_changes(df: pd.DataFrame) -> tuple[pd.DataFrame, dict, datetime] | None:
+    """
+    Bring a prepared dataset up to date since the last-sync watermark.
+    - Changed ids come from TMDB's changes feed; only ids already in the dataset are re-fetched.
+    - New movies come from a discover query bounded to recent release dates.
+    Returns (updated_df, stats, fetch_started), or None when a full refresh is needed
+    instead (no watermark, or the watermark is older than the changes feed window).
+    The watermark is not advanced here: save fetch_started once the result is persisted.
+    """
+    last_sync = load_last_sync()
+    now = datetime.now(timezone.utc)
+    if last_sync is None or now - last_sync > timedelta(days=config.DELTA_MAX_WINDOW_DAYS):
+        return None
+
+    # Changed movies we already know about
+    changes = fetch_pages(
+        partial(
+            fetch_movie_changes_page,
+            start_date=last_sync.date().isoformat(),
+            end_date=now.date().isoformat(),
+        ),
+        config.MAX_TMDB_PAGES,
+    )
+    known_ids = set(df["id"])
+    changed_ids = {c["id"] for c in changes if c.get("id") in known_ids}
+
+    rows = {}
+    removed_ids = set()
+    fetch_fresh_details = partial(fetch_movie_details, max_age=0)
+    for movie_id, details in iter_concurrent(fetch_fresh_details, changed_ids):
+        if details is None:
+            removed_ids.add(movie_id)
+            continue
+        row = _details_to_discover_row(details)
+        if _qualifies(row):
+            rows[movie_id] = row
+        else:
+            removed_ids.add(movie_id)
+
+    # Newly qualifying movies among recent releases
+    since = last_sync - timedelta(days=config.DELTA_NEW_RELEASE_LOOKBACK_DAYS)
+    recent = fetch_pages(
+        partial(
+            fetch_discover_page, release_date_gte=since.date().isoformat(), max_age=0
+        ),
+        config.MAX_TMDB_PAGES,
+    )
+    for movie in recent:
+        # Details fetched above are at least as fresh as the discover row
+        rows.setdefault(movie["id"], movie)
+
+    builder = ColumnBuilder()
+    builder.add(list(rows.values()))
+    updates = prepare_df(builder.to_frame(), copy=False) if rows else pd.DataFrame()
+    df_updated = upsert_movies(df, updates, removed_ids)
+
+    stats = {
+        "updated": len(known_ids & set(rows)),
+        "added": len(set(rows) - known_ids),
+        "removed": len(removed_ids & known_ids),
+    }
+    return df_updated, stats, now
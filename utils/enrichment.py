@@ -0,0 +1,106 @@
+"""
+Movie-detail enrichment: fetch /movie/{id} with credits and keywords for every
+movie that is new or stale, and store the results in typed columns.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+import pandas as pd
+import config
+from utils.fetch_engine import iter_concurrent
+from utils.tmdb_api import fetch_movie_details
+
+# Columns added next to the prepare_df output, with their dtypes
+ENRICHMENT_COLUMNS = {
+    "runtime": "Int32",
+    "budget": "Int64",
+    "revenue": "Int64",
+    "director": "string",
+    "top_cast": "string",
+    "keywords": "string",
+    "enriched_at": "datetime64[ns, UTC]",
+}
+
+
+def fetch_movie_enrichment(movie_id: int) -> dict | None:
+    """One request per movie: details plus credits and keywords via append_to_response."""
+    return fetch_movie_details(movie_id, append_to_response=config.ENRICHMENT_APPEND)
+
+
+def extract_enrichment(details: dict) -> dict:
+    """Pick the enrichment fields out of a /movie/{id} payload."""
+    credits = details.get("credits") or {}
+    directors = [c["name"] for c in credits.get("crew", []) if c.get("job") == "Director"]
+    cast = sorted(credits.get("cast", []), key=lambda c: c.get("order", 0))
+    keywords = (details.get("keywords") or {}).get("keywords", [])
+
+    return {
+        "runtime": details.get("runtime") or None,
+        # TMDB uses 0 for "unknown" budget and revenue
+        "budget": details.get("budget") or None,
+        "revenue": details.get("revenue") or None,
+        "director": ", ".join(directors) or None,
+        "top_cast": ", ".join(c["name"] for c in cast[: config.ENRICHMENT_TOP_CAST]) or None,
+        "keywords": ", ".join(k["name"] for k in keywords) or None,
+    }
+
+
+def ensure_enrichment_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add missing enrichment columns and restore their dtypes (e.g. after a CSV load)."""
+    for column, dtype in ENRICHMENT_COLUMNS.items():
+        if column not in df.columns:
+            df[column] = pd.Series(pd.NA, index=df.index, dtype=dtype)
+        elif column == "enriched_at":
+            df[column] = pd.to_datetime(df[column], errors="coerce", utc=True)
+        elif dtype.startswith("Int"):
+            df[column] = pd.to_numeric(df[column], errors="coerce").round().astype(dtype)
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def stale_movie_ids(df: pd.DataFrame, max_age_days: float = config.ENRICHMENT_MAX_AGE_DAYS) -> list[int]:
+    """Ids never enriched, or enriched longer ago than max_age_days."""
+    if "enriched_at" not in df.columns:
+        return df["id"].tolist()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    stale = df["enriched_at"].isna() | (df["enriched_at"] < cutoff)
+    return df.loc[stale, "id"].tolist()
+
+
+def enrich_movies(
+    df: pd.DataFrame,
+    on_progress: Callable[[int, int], None] | None = None,
+    max_age_days: float = config.ENRICHMENT_MAX_AGE_DAYS,
+) -> pd.DataFrame:
+    """
+    Enrich new or stale movies in place (bounded concurrency, shared rate limiter)
+    and return df. on_progress(done, total) is called from the calling thread.
+    Interrupted runs are cheap to repeat: fetched details sit in the disk response cache.
+    """
+    ensure_enrichment_columns(df)
+    movie_ids = stale_movie_ids(df, max_age_days)
+    if not movie_ids:
+        return df
+
+    enriched = {}
+    now = datetime.now(timezone.utc)
+    for done, (movie_id, details) in enumerate(
+        iter_concurrent(fetch_movie_enrichment, movie_ids), start=1
+    ):
+        # Movies gone from TMDB are still stamped so they aren't retried on every run
+        enriched[movie_id] = extract_enrichment(details) if details else {}
+        if on_progress:
+            on_progress(done, len(movie_ids))
+
+    updates = pd.DataFrame.from_dict(enriched, orient="index")
+    rows = df["id"].isin(updates.index)
+    ids = df.loc[rows, "id"]
+    for column in ENRICHMENT_COLUMNS:
+        if column == "enriched_at":
+            df.loc[rows, column] = now
+        elif column in updates.columns:
+            df.loc[rows, column] = (
+                ids.map(updates[column]).astype(ENRICHMENT_COLUMNS[column]).values
+            )
+    return df
@@ -0,0 +1,202 @@
+"""
+Concurrent fetch engine for TMDB with a shared token-bucket rate limiter.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator
+import config
+
+
+class RateLimitError(RuntimeError):
+    """Raised by a fetch function when TMDB answers 429 Too Many Requests."""
+
+    def __init__(self, retry_after: float | None = None):
+        super().__init__("TMDB rate limit exceeded")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker.
+    A 429 pauses all workers and halves the refill rate; successes restore it gradually.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._backoff = 1.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    elapsed = max(0.0, now - self._updated)
+                    self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, retry_after: float | None = None) -> float:
+        """Pause all workers after a 429 and halve the rate. Returns the pause length."""
+        with self._lock:
+            delay = retry_after if retry_after else self._backoff
+            delay = min(delay, config.TMDB_BACKOFF_MAX)
+            self._backoff = min(self._backoff * 2, config.TMDB_BACKOFF_MAX)
+            self.rate = max(1.0, self.rate / 2)
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._updated = self._paused_until
+            return delay
+
+    def recover(self) -> None:
+        """Record a successful request: reset backoff and creep back to the full rate."""
+        with self._lock:
+            self._backoff = 1.0
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + 0.5)
+
+    @property
+    def throttled(self) -> bool:
+        return self.rate < self.max_rate
+
+
+# One limiter per process so every fetch path shares TMDB's request budget
+_limiter = TokenBucket(config.TMDB_RATE_LIMIT, config.TMDB_RATE_BURST)
+
+
+def get_rate_limiter() -> TokenBucket:
+    return _limiter
+
+
+def reset_rate_limiter(
+    rate: float = config.TMDB_RATE_LIMIT, capacity: float = config.TMDB_RATE_BURST
+) -> TokenBucket:
+    """Replace the shared limiter (e.g. for benchmarks against a local server)."""
+    global _limiter
+    _limiter = TokenBucket(rate, capacity)
+    return _limiter
+
+
+def call_limited(fn: Callable, *args, **kwargs):
+    """Call fn through the shared limiter, retrying on RateLimitError."""
+    for _ in range(config.TMDB_MAX_RATE_LIMIT_RETRIES):
+        _limiter.acquire()
+        try:
+            result = fn(*args, **kwargs)
+        except RateLimitError as e:
+            _limiter.throttle(e.retry_after)
+            continue
+        _limiter.recover()
+        return result
+    raise RateLimitError()
+
+
+def iter_concurrent(
+    fn: Callable,
+    items: Iterable,
+    workers: int | None = None,
+    journal=None,
+    key: Callable | None = None,
+) -> Iterator[tuple]:
+    """
+    Run fn(item) for every item on a bounded worker pool.
+    Yields (item, result) in completion order, in the calling thread.
+    With a journal, items already recorded under key(item) are replayed without a
+    request and new results are recorded as they complete.
+    """
+    pending = []
+    for item in items:
+        done = journal.get(key(item)) if journal is not None else None
+        if done is not None:
+            yield item, done
+        else:
+            pending.append(item)
+
+    pool = ThreadPoolExecutor(max_workers=workers or config.TMDB_FETCH_WORKERS)
+    try:
+        futures = {pool.submit(call_limited, fn, item): item for item in pending}
+        for future in as_completed(futures):
+            item = futures[future]
+            result = future.result()
+            if journal is not None:
+                journal.record(key(item), result)
+            yield item, result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_pages(
+    fetch_page: Callable[[int], dict],
+    max_pages: int,
+    on_progress: Callable[[int, int, int], None] | None = None,
+    workers: int | None = None,
+    journal=None,
+) -> Iterator[tuple[int, list[dict]]]:
+    """
+    Fetch discover pages 1..N concurrently, yielding (page, results) as each page arrives.
+    Page 1 is fetched first to learn total_pages, the rest run on the worker pool.
+    on_progress(pages_done, total_pages, movies_so_far) is called from the calling thread.
+    An optional RunJournal makes the fetch resumable page by page.
+    """
+    key = lambda page: f"page:{page}"
+    [(_, first)] = iter_concurrent(fetch_page, [1], journal=journal, key=key)
+    total_pages = min(first.get("total_pages", max_pages), max_pages)
+    results = first.get("results", [])
+    pages_done, movie_count = 1, len(results)
+
+    if on_progress:
+        on_progress(pages_done, max(total_pages, 1), movie_count)
+    yield 1, results
+
+    if results and total_pages > 1:
+        for page, data in iter_concurrent(
+            fetch_page,
+            range(2, total_pages + 1),
+            workers=workers,
+            journal=journal,
+            key=key,
+        ):
+            results = data.get("results", [])
+            pages_done += 1
+            movie_count += len(results)
+            if on_progress:
+                on_progress(pages_done, total_pages, movie_count)
+            yield page, results
+
+
+def fetch_pages(
+    fetch_page: Callable[[int], dict],
+    max_pages: int,
+    on_progress: Callable[[int, int, int], None] | None = None,
+    workers: int | None = None,
+    journal=None,
+) -> list[dict]:
+    """
+    Fetch discover pages 1..N concurrently and return all result dicts in page order.
+    See iter_pages for the streaming form.
+    """
+    pages = dict(iter_pages(fetch_page, max_pages, on_progress, workers, journal))
+
+    # Same result as the sequential loop: stop at the first empty page
+    all_movies = []
+    for page in range(1, len(pages) + 1):
+        movies = pages.get(page)
+        if not movies:
+            break
+        all_movies.extend(movies)
+
+    return all_movies
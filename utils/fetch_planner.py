@@ -0,0 +1,132 @@
+"""
+Fetch planner that splits the discover catalog into disjoint partitions
+(release-date windows x vote-count bands) so each stays under TMDB's page cap.
+"""
+
+from datetime import date, timedelta
+from typing import Callable, Iterator, NamedTuple
+import config
+from utils.fetch_engine import iter_concurrent
+
+
+class Partition(NamedTuple):
+    """One disjoint slice of the catalog. Bounds are inclusive; None means open."""
+
+    release_date_gte: date
+    release_date_lte: date
+    vote_count_gte: int
+    vote_count_lte: int | None = None
+
+
+def initial_partitions() -> list[Partition]:
+    """Full configured date range, one partition per vote-count band."""
+    start = date(config.MIN_YEAR, 1, 1)
+    end = date(config.MAX_YEAR, 12, 31)
+    bounds = list(config.TMDB_VOTE_COUNT_BANDS)
+    partitions = []
+    for i, low in enumerate(bounds):
+        high = bounds[i + 1] - 1 if i + 1 < len(bounds) else None
+        partitions.append(Partition(start, end, low, high))
+    return partitions
+
+
+def split_partition(part: Partition) -> list[Partition]:
+    """
+    Split a partition in two disjoint halves: bisect the date window first,
+    then the vote-count band once the window is a single day.
+    Returns [] if the partition cannot be split any further.
+    """
+    if part.release_date_lte > part.release_date_gte:
+        span = (part.release_date_lte - part.release_date_gte).days
+        mid = part.release_date_gte + timedelta(days=span // 2)
+        return [
+            part._replace(release_date_lte=mid),
+            part._replace(release_date_gte=mid + timedelta(days=1)),
+        ]
+
+    low, high = part.vote_count_gte, part.vote_count_lte
+    if high is None:
+        mid = low * 2
+    elif high > low:
+        mid = (low + high) // 2
+    else:
+        return []
+    return [
+        part._replace(vote_count_lte=mid),
+        part._replace(vote_count_gte=mid + 1),
+    ]
+
+
+def _task_key(task: tuple[Partition, int]) -> str:
+    part, page = task
+    return (
+        f"{part.release_date_gte}:{part.release_date_lte}:"
+        f"{part.vote_count_gte}:{part.vote_count_lte}:{page}"
+    )
+
+
+def iter_partition_pages(
+    fetch_page: Callable[[Partition, int], dict],
+    max_pages: int = config.MAX_TMDB_PAGES,
+    on_progress: Callable[[int, int, int], None] | None = None,
+    workers: int | None = None,
+    journal=None,
+) -> Iterator[tuple[tuple[Partition, int], list[dict]]]:
+    """
+    Plan and crawl every partition, yielding ((partition, page), results) as pages arrive.
+    Planning probes page 1 of each candidate partition (the probe is kept as real data)
+    and splits any partition whose total_pages exceeds max_pages.
+    on_progress(pages_done, total_pages, movies_so_far) is called from the calling thread.
+    With a RunJournal, probes and pages completed by an interrupted run are replayed
+    from disk, so planning and crawling resume without repeating requests.
+    Results are not deduplicated: a movie can move between bands mid-crawl.
+    """
+    pages_done = 0
+    movie_count = 0
+    remaining = []  # (partition, page) tasks left after planning
+
+    # Planning: probe, then split oversized partitions until all fit under the cap
+    pending = initial_partitions()
+    while pending:
+        next_pending = []
+        probes = [(part, 1) for part in pending]
+        for task, first in iter_concurrent(
+            lambda task: fetch_page(*task),
+            probes,
+            workers=workers,
+            journal=journal,
+            key=_task_key,
+        ):
+            part = task[0]
+            pages_done += 1
+            total_pages = first.get("total_pages", 0)
+            if total_pages > max_pages:
+                halves = split_partition(part)
+                if halves:
+                    next_pending.extend(halves)
+                    continue
+                total_pages = max_pages  # unsplittable: accept the cap
+            results = first.get("results", [])
+            movie_count += len(results)
+            remaining.extend((part, page) for page in range(2, total_pages + 1))
+            if on_progress:
+                on_progress(pages_done, pages_done + len(remaining), movie_count)
+            yield task, results
+        pending = next_pending
+
+    # Crawl: every remaining page of every partition on one shared pool
+    total = pages_done + len(remaining)
+    for task, data in iter_concurrent(
+        lambda task: fetch_page(*task),
+        remaining,
+        workers=workers,
+        journal=journal,
+        key=_task_key,
+    ):
+        results = data.get("results", [])
+        pages_done += 1
+        movie_count += len(results)
+        if on_progress:
+            on_progress(pages_done, total, movie_count)
+        yield task, results
+
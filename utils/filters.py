@@ -3,10 +3,10 @@ Sidebar filter functions for user interface filters.
 """
 
 import streamlit as st
-from ast import literal_eval
 import config
-from utils.genre import fetch_genre_map
-from utils.csv_persistence import delete_csv_cache
+from utils.data_loader import get_facets, request_refresh
+from utils.delta_sync import load_last_sync
+from utils.background_refresh import get_refresher, format_age
 
 
 def render_sidebar_filters(df):
@@ -38,7 +38,9 @@ def render_sidebar_filters(df):
             "min_rating": config.DEFAULT_MIN_RATING,
             "max_popularity": config.DEFAULT_MAX_POPULARITY,
             "min_vote_count": config.DEFAULT_MIN_VOTE_COUNT,
-            "genre": "All",
+            "genres": [],
+            "genre_match": "any",
+            "exclude_genres": [],
             "adult": False,
             "include_missing_dates": False,
             "min_year": None,
@@ -47,14 +49,15 @@ def render_sidebar_filters(df):
         }
 
     g = st.session_state[SKEY]
+    # Stores created before multi-genre filters had a single "genre"
+    g.setdefault("genres", [])
+    g.setdefault("genre_match", "any")
+    g.setdefault("exclude_genres", [])
 
     # Year bounds from data (for initializing filter values)
-    min_year_val = (
-        int(df["year"].min()) if df["year"].notna().any() else config.MIN_YEAR
-    )
-    max_year_val = (
-        int(df["year"].max()) if df["year"].notna().any() else config.MAX_YEAR
-    )
+    facets = get_facets(df)
+    min_year_val = facets["min_year"] if facets["min_year"] is not None else config.MIN_YEAR
+    max_year_val = facets["max_year"] if facets["max_year"] is not None else config.MAX_YEAR
 
     # Initialize years in global store once (use data bounds, but clamp to config range)
     if g["min_year"] is None:
@@ -97,78 +100,29 @@ def render_sidebar_filters(df):
             key=W + "min_vote_count",
         )
 
-        # Get all unique genres from the dataframe
-        # Prioritize genres_str as it's more reliable (always a string)
-        all_genres = set()
-
-        # First try genres_str (most reliable - always comma-separated string)
-        if "genres_str" in df.columns:
-            for genre_str in df["genres_str"].dropna():
-                if (
-                    isinstance(genre_str, str)
-                    and genre_str != "Unknown"
-                    and genre_str.strip()
-                ):
-                    # Split by comma and clean up
-                    genres = [
-                        g.strip()
-                        for g in genre_str.split(",")
-                        if g.strip() and g.strip() != "Unknown"
-                    ]
-                    all_genres.update(genres)
-
-        # Fallback to genres column (list of genre names)
-        if not all_genres and "genres" in df.columns:
-            for genre_list in df["genres"].dropna():
-                # Handle both list and string representation of list
-                if isinstance(genre_list, list):
-                    all_genres.update([g for g in genre_list if g and g != "Unknown"])
-                elif isinstance(genre_list, str):
-                    # Try to parse string representation of list
-                    try:
-                        parsed = literal_eval(genre_list)
-                        if isinstance(parsed, list):
-                            all_genres.update(
-                                [g for g in parsed if g and g != "Unknown"]
-                            )
-                    except:
-                        # If parsing fails, try splitting by comma
-                        if "," in genre_list:
-                            all_genres.update(
-                                [
-                                    g.strip()
-                                    for g in genre_list.split(",")
-                                    if g.strip() and g.strip() != "Unknown"
-                                ]
-                            )
-
-        # If no genres found, try to regenerate from genre_ids
-        if not all_genres and "genre_ids" in df.columns:
-            genre_map = fetch_genre_map()
-            for genre_ids in df["genre_ids"].dropna():
-                if isinstance(genre_ids, list):
-                    genres = [
-                        genre_map.get(gid, "Unknown")
-                        for gid in genre_ids
-                        if genre_map.get(gid)
-                    ]
-                    all_genres.update([g for g in genres if g != "Unknown"])
-
-        genres_list = ["All"] + sorted([g for g in all_genres if g and g != "Unknown"])
-
-        if g["genre"] not in genres_list:
-            g["genre"] = "All"
-
-        genre = st.selectbox(
-            "Genre", genres_list, index=genres_list.index(g["genre"]), key=W + "genre"
-        )
+        # Genre and language options are precomputed once per snapshot
+        genres_list = facets["genres"]
 
-        # Filter by language
-        all_languages = set()
+        g["genres"] = [name for name in g["genres"] if name in genres_list]
+        g["exclude_genres"] = [name for name in g["exclude_genres"] if name in genres_list]
 
-        all_languages.update(df["original_language_name"].dropna())
+        genres = st.multiselect(
+            "Genres", genres_list, default=g["genres"], key=W + "genres"
+        )
+        genre_match = st.radio(
+            "Match",
+            ["any", "all"],
+            index=["any", "all"].index(g["genre_match"]),
+            format_func={"any": "Any selected genre", "all": "All selected genres"}.get,
+            horizontal=True,
+            key=W + "genre_match",
+        )
+        exclude_genres = st.multiselect(
+            "Exclude Genres", genres_list, default=g["exclude_genres"], key=W + "exclude_genres"
+        )
 
-        language_list = ["All"] + sorted([lang for lang in all_languages if lang])
+        # Filter by language
+        language_list = ["All"] + [lang for lang in facets["languages"] if lang]
         if g["original_language_name"] not in language_list:
             g["original_language_name"] = "All"
 
@@ -210,7 +164,9 @@ def render_sidebar_filters(df):
         g["min_rating"] = min_rating
         g["max_popularity"] = max_popularity
         g["min_vote_count"] = min_vote_count
-        g["genre"] = genre
+        g["genres"] = genres
+        g["genre_match"] = genre_match
+        g["exclude_genres"] = exclude_genres
         g["min_year"] = min_year
         g["max_year"] = max_year
         g["adult"] = adult
@@ -219,20 +175,45 @@ def render_sidebar_filters(df):
 
         st.divider()
 
-        if st.button("🔄 Refresh Data", use_container_width=True, key=W + "refresh"):
-            st.cache_data.clear()
-            # Delete CSV cache to force fresh fetch
-            delete_csv_cache()
-            # Clear only data; keep GLOBAL_FILTERS so filters persist
-            for k in [
-                "tmdb_prepared_data",
-                "tmdb_show_progress",
-                "tmdb_data_loaded",
-                "csv_loaded_notified",
-            ]:
-                if k in st.session_state:
-                    del st.session_state[k]
-            st.rerun()
+        refresher = get_refresher()
+        if config.WEB_APP_INGESTION:
+            full_rebuild = st.checkbox(
+                "Full rebuild",
+                value=False,
+                key=W + "full_rebuild",
+                help="Re-crawl the whole catalog instead of syncing recent changes.",
+                disabled=refresher.refreshing,
+            )
+            if st.button(
+                "🔄 Refresh Data",
+                use_container_width=True,
+                key=W + "refresh",
+                disabled=refresher.refreshing,
+            ):
+                # Runs in the background; the current data stays on screen until it's done
+                request_refresh(full=full_rebuild)
+                st.rerun()
+        else:
+            st.caption("Data is refreshed by the ingestion job (`python -m utils.ingest`).")
+
+        if refresher.refreshing:
+            st.caption(f"🔄 Refreshing in background... {refresher.status}")
+            st.progress(refresher.progress)
+        elif refresher.last_error:
+            st.caption(f"⚠️ Last refresh failed: {refresher.last_error}")
+
+        snapshot = refresher.snapshot
+        if snapshot is not None:
+            st.caption(f"🗂️ Data age: {format_age(snapshot.age)}")
+        stats = refresher.last_stats
+        if stats:
+            st.caption(
+                f"Last refresh: {stats['updated']:,} updated, "
+                f"{stats['added']:,} added, {stats['removed']:,} removed"
+            )
+        last_sync = load_last_sync()
+        if last_sync is not None:
+            st.caption(f"🕒 Last sync: {last_sync.astimezone():%Y-%m-%d %H:%M}")
 
         st.divider()
         st.caption(f"📊 Total Movies: {len(df):,}")
@@ -242,7 +223,9 @@ def render_sidebar_filters(df):
         "min_rating": g["min_rating"],
         "max_popularity": g["max_popularity"],
         "min_vote_count": g["min_vote_count"],
-        "genre": g["genre"],
+        "genres": g["genres"],
+        "genre_match": g["genre_match"],
+        "exclude_genres": g["exclude_genres"],
         "adult": g["adult"],
         "min_year": g["min_year"],
         "max_year": g["max_year"],
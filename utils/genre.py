@@ -1,52 +1,85 @@
 """
 Genre-related functions for fetching and mapping genre data from TMDB.
 """
-import streamlit as st
-import requests
+import logging
+import numpy as np
+import pandas as pd
 import config
-import os
-from dotenv import load_dotenv
+from utils.http_client import tmdb_cached_json, tmdb_get_json
+from utils.memo import ttl_cache
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Load TMDB Bearer Token from environment variable
-TMDB_BEARER_TOKEN = os.getenv("TMDB_BEARER_TOKEN")
-if not TMDB_BEARER_TOKEN:
-    raise ValueError(
-        "TMDB_BEARER_TOKEN not found in environment variables. Please create a .env file with your token."
-    )
+# TMDB's movie genre list (stable); used when no network or cached response is available
+TMDB_MOVIE_GENRES = {
+    28: "Action", 12: "Adventure", 16: "Animation", 35: "Comedy", 80: "Crime",
+    99: "Documentary", 18: "Drama", 10751: "Family", 14: "Fantasy", 36: "History",
+    27: "Horror", 10402: "Music", 9648: "Mystery", 10749: "Romance",
+    878: "Science Fiction", 10770: "TV Movie", 53: "Thriller", 10752: "War", 37: "Western",
+}
+
+# Bit of each genre in the genre_mask column. Fixed (append new genres at the end),
+# so masks mean the same thing in every snapshot. Genres without a bit are only
+# matched through the genres lists.
+GENRE_BITS = {genre_id: bit for bit, genre_id in enumerate(TMDB_MOVIE_GENRES)}
+GENRE_NAME_BITS = {TMDB_MOVIE_GENRES[genre_id]: bit for genre_id, bit in GENRE_BITS.items()}
+GENRE_MASK_DTYPE = np.int32
+
+
+@ttl_cache(ttl=config.GENRE_CACHE_TTL)
+def _fetch_genre_map() -> dict[int, str]:
+    data = tmdb_get_json(config.TMDB_GENRE_URL, params={"language": "en-US"})
 
-# Ensure token starts with "Bearer " prefix
-if not TMDB_BEARER_TOKEN.startswith("Bearer "):
-    TMDB_BEARER_TOKEN = f"Bearer {TMDB_BEARER_TOKEN}"
+    # Build mapping: {genre_id: genre_name}
+    return {genre["id"]: genre["name"] for genre in data.get("genres", [])}
 
 
-@st.cache_data(ttl=config.GENRE_CACHE_TTL)
 def fetch_genre_map() -> dict[int, str]:
     """
     Fetch genre ID to name mapping from TMDB.
     Returns dict mapping genre_id -> genre_name.
     Unknown IDs will map to "Unknown".
     """
-    headers = {
-        "accept": "application/json",
-        "Authorization": TMDB_BEARER_TOKEN,
-    }
-
     try:
-        response = requests.get(
-            config.TMDB_GENRE_URL,
-            headers=headers,
-            params={"language": "en-US"},
-            timeout=20,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        # Build mapping: {genre_id: genre_name}
-        genre_map = {genre["id"]: genre["name"] for genre in data.get("genres", [])}
-        return genre_map
+        return _fetch_genre_map()
     except Exception as e:
-        st.warning(f"Failed to fetch genre map: {e}. Using empty map.")
+        # Not memoized, so the next call retries
+        logger.warning("Failed to fetch genre map: %s. Using empty map.", e)
         return {}
+
+
+def offline_genre_map() -> dict[int, str]:
+    """Genre map without network access: the cached TMDB response, else the built-in list."""
+    data = tmdb_cached_json(config.TMDB_GENRE_URL, params={"language": "en-US"})
+    if not data:
+        return dict(TMDB_MOVIE_GENRES)
+    return {genre["id"]: genre["name"] for genre in data.get("genres", [])}
+
+
+def genre_mask(genre_ids: pd.Series) -> np.ndarray:
+    """Bitmask of genre membership per row of a genre_ids list column (vectorized)."""
+    lengths = np.fromiter((len(ids) for ids in genre_ids), dtype=np.int64, count=len(genre_ids))
+    flat = np.fromiter(
+        (gid for ids in genre_ids for gid in ids), dtype=np.int64, count=int(lengths.sum())
+    )
+
+    known = np.array(list(GENRE_BITS), dtype=np.int64)
+    bits = np.array(list(GENRE_BITS.values()), dtype=np.int64)
+    order = np.argsort(known)
+    known, bits = known[order], bits[order]
+    pos = np.searchsorted(known, flat).clip(max=len(known) - 1)
+    values = np.where(known[pos] == flat, 1 << bits[pos], 0).astype(GENRE_MASK_DTYPE)
+
+    mask = np.zeros(len(genre_ids), dtype=GENRE_MASK_DTYPE)
+    np.bitwise_or.at(mask, np.repeat(np.arange(len(genre_ids)), lengths), values)
+    return mask
+
+
+def genre_names_mask(names) -> int | None:
+    """Combined bit of the given genre names, or None if any of them has no bit."""
+    mask = 0
+    for name in names:
+        if name not in GENRE_NAME_BITS:
+            return None
+        mask |= 1 << GENRE_NAME_BITS[name]
+    return mask
@@ -0,0 +1,177 @@
+"""
+Shared HTTP client used by every TMDB call.
+One pooled keep-alive session with uniform timeouts, retries and compression.
+"""
+
+import os
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+from dotenv import load_dotenv
+import config
+from utils.fetch_engine import RateLimitError
+from utils.response_cache import CacheMissError, ResponseCache, cache_key
+
+# Load environment variables
+load_dotenv()
+
+# Load TMDB Bearer Token from environment variable
+TMDB_BEARER_TOKEN = os.getenv("TMDB_BEARER_TOKEN")
+if not TMDB_BEARER_TOKEN:
+    raise ValueError(
+        "TMDB_BEARER_TOKEN not found in environment variables. Please create a .env file with your token."
+    )
+
+# Ensure token starts with "Bearer " prefix
+if not TMDB_BEARER_TOKEN.startswith("Bearer "):
+    TMDB_BEARER_TOKEN = f"Bearer {TMDB_BEARER_TOKEN}"
+
+# TMDB_OFFLINE=1 serves every request from the response cache with zero network
+TMDB_OFFLINE = os.getenv("TMDB_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+def _build_session() -> requests.Session:
+    """Create the pooled session. Pool size matches the fetch worker count."""
+    # 429 is deliberately not retried here: it is raised as RateLimitError so the
+    # shared limiter can slow every worker at once instead of just this one.
+    retry = Retry(
+        total=config.TMDB_HTTP_RETRIES,
+        backoff_factor=config.TMDB_HTTP_BACKOFF,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=("GET",),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=config.TMDB_FETCH_WORKERS,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "accept": "application/json",
+            "Authorization": TMDB_BEARER_TOKEN,
+            # gzip/deflate, plus br/zstd when the decoders are installed
+            **make_headers(accept_encoding=True),
+        }
+    )
+    return session
+
+
+_session = _build_session()
+# Opened on first use, so importing the data layer never creates the cache file
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    return _session
+
+
+def get_response_cache() -> ResponseCache | None:
+    """The shared disk cache, or None when HTTP_CACHE_ENABLED is off."""
+    global _cache
+    if _cache is None and config.HTTP_CACHE_ENABLED:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def tmdb_get(
+    url: str, params: dict | None = None, headers: dict | None = None
+) -> requests.Response:
+    """
+    GET a TMDB endpoint through the shared session.
+    Raises RateLimitError on 429 and requests.HTTPError on any other failure.
+    """
+    response = _session.get(
+        url,
+        params=params,
+        headers=headers,
+        timeout=(config.TMDB_CONNECT_TIMEOUT, config.TMDB_READ_TIMEOUT),
+    )
+
+    if response.status_code == 429:
+        raise RateLimitError(_retry_after(response))
+
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+
+def tmdb_get_json(
+    url: str, params: dict | None = None, max_age: float = config.TMDB_CACHE_TTL
+) -> dict | list:
+    """
+    GET a TMDB endpoint and return the decoded JSON body, through the disk cache.
+    - Cached responses younger than max_age are returned without a request.
+    - Older ones are revalidated with If-None-Match / If-Modified-Since; a 304 reuses the body.
+    - In offline mode only the cache is used and a miss raises CacheMissError.
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return tmdb_get(url, params).json()
+
+    key = cache_key(url, params)
+    cached = cache.get(key)
+
+    if TMDB_OFFLINE:
+        if cached is None:
+            raise CacheMissError(f"Offline and not cached: {url} {params}")
+        return cached.json()
+
+    if cached is not None and cached.age < max_age:
+        return cached.json()
+
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    response = tmdb_get(url, params, headers=headers)
+
+    if response.status_code == 304 and cached is not None:
+        cache.touch(key)
+        return cached.json()
+
+    cache.put(
+        key,
+        url,
+        response.content,
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+    )
+    return response.json()
+
+
+def tmdb_cached_json(url: str, params: dict | None = None) -> dict | list | None:
+    """The cached JSON body for a request regardless of age, or None. Never touches the network."""
+    cache = get_response_cache()
+    if cache is None:
+        return None
+    cached = cache.get(cache_key(url, params))
+    return None if cached is None else cached.json()
@@ -0,0 +1,198 @@
+"""
+Headless ingestion: fetch, prepare, enrich and persist the movie snapshot
+without Streamlit, e.g. from cron or a sidecar next to the web app.
+
+    python -m utils.ingest             # delta sync when possible, full crawl otherwise
+    python -m utils.ingest --full      # always re-crawl
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable
+import pandas as pd
+import config
+from utils.tmdb_api import fetch_movies
+from utils.data_processing import prepare_df
+from utils.enrichment import enrich_movies
+from utils.delta_sync import sync_changes, save_last_sync
+from utils.csv_persistence import save_data_to_csv
+from utils.snapshot_persistence import load_snapshot, publish_snapshot, upgrade_snapshot
+from utils.fetch_engine import get_rate_limiter
+from utils.http_client import get_response_cache
+
+logger = logging.getLogger(__name__)
+
+# Exit codes
+EXIT_OK = 0
+EXIT_FAILED = 1  # fetch / prepare failed (network, token, TMDB errors)
+EXIT_NOT_SAVED = 3  # dataset built but the snapshot could not be written
+EXIT_INTERRUPTED = 130  # rerun to resume from the crawl journal
+
+# report(status, progress): progress is a 0..1 fraction, or None for a new phase
+Reporter = Callable[[str, float | None], None]
+
+
+def _rebuild(max_pages: int, revalidate: bool, report: Reporter) -> tuple[pd.DataFrame, datetime]:
+    """Full crawl, returning the frame and the time fetching started. When replacing
+    existing data, revalidate the disk cache (unchanged pages then cost only a 304)."""
+    fetch_started = datetime.now(timezone.utc)
+    if revalidate:
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            response_cache.expire()
+
+    limiter = get_rate_limiter()
+
+    def on_progress(pages_done: int, total_pages: int, movie_count: int):
+        progress = min(1.0, pages_done / max(total_pages, 1))
+        if limiter.throttled:
+            report(f"⏳ Rate limited, slowing down... page {pages_done}/{total_pages}", progress)
+        else:
+            report(f"📥 Page {pages_done}/{total_pages} | movies {movie_count:,}", progress)
+
+    report("Crawling TMDB...", None)
+    df_raw = fetch_movies(max_pages, on_progress)
+    if df_raw.empty:
+        raise RuntimeError("No movies fetched. Please check your TMDB token / connection.")
+
+    report("Preparing dataset...", None)
+    df = prepare_df(df_raw, copy=False)
+    return df, fetch_started
+
+
+def ingest(
+    df: pd.DataFrame | None = None,
+    full: bool = False,
+    max_pages: int = config.DEFAULT_FETCH_PAGES,
+    enrich: bool = config.ENRICH_MOVIE_DETAILS,
+    report: Reporter | None = None,
+) -> tuple[pd.DataFrame, dict | None, datetime]:
+    """
+    Bring a prepared dataset up to date without touching df: delta sync when possible,
+    full crawl when df is None, full=True or the delta window has lapsed.
+    Returns (new_df, delta_stats, fetch_started), delta_stats being None after a full
+    crawl. Persisting the result, then save_last_sync(fetch_started), is up to the caller.
+    """
+    report = report or (lambda status, progress: None)
+    df_new, stats, fetch_started = None, None, None
+
+    if df is not None and not full:
+        report("Syncing changes from TMDB...", None)
+        try:
+            result = sync_changes(df)
+        except Exception as e:
+            logger.warning("Delta sync failed: %s. Falling back to a full crawl.", e)
+            result = None
+        if result is not None:
+            df_new, stats, fetch_started = result
+
+    if df_new is None:
+        df_new, fetch_started = _rebuild(max_pages, revalidate=df is not None, report=report)
+
+    if enrich:
+        report("Fetching movie details...", None)
+        enrich_movies(
+            df_new,
+            lambda done, total: report(
+                f"🎞️ Movie details {done:,}/{total:,}", min(1.0, done / max(total, 1))
+            ),
+        )
+
+    return df_new, stats, fetch_started
+
+
+def _log_reporter(interval: float) -> Reporter:
+    """Log every phase change, and progress at most once per interval seconds."""
+    last_logged = 0.0
+
+    def report(status: str, progress: float | None):
+        nonlocal last_logged
+        now = time.monotonic()
+        if progress is None or progress >= 1.0 or now - last_logged >= interval:
+            last_logged = now
+            logger.info(status)
+
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.ingest",
+        description="Fetch, prepare and persist the TMDB movie snapshot.",
+    )
+    parser.add_argument("--full", action="store_true", help="ignore the current snapshot and re-crawl")
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=config.DEFAULT_FETCH_PAGES,
+        help="discover pages per query (default: %(default)s)",
+    )
+    parser.add_argument("--no-enrich", action="store_true", help="skip /movie/{id} detail enrichment")
+    parser.add_argument(
+        "--export-csv", action="store_true", help=f"also write a CSV export to {config.CSV_DATA_FILE}"
+    )
+    parser.add_argument("--log-interval", type=float, default=10.0, help="seconds between progress lines")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("-v", "--verbose", action="store_true")
+    verbosity.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    started = time.monotonic()
+    df = None
+    if not args.full:
+        # Older schemas and legacy Parquet/CSV snapshots are migrated offline first
+        manifest = upgrade_snapshot()
+        if manifest is not None:
+            df = load_snapshot(manifest=manifest)
+    logger.info(
+        "Starting %s (%s)",
+        "full crawl" if df is None else "delta sync",
+        f"{len(df):,} movies in snapshot" if df is not None else "no snapshot",
+    )
+
+    try:
+        df_new, stats, fetch_started = ingest(
+            df,
+            full=args.full,
+            max_pages=args.max_pages,
+            enrich=config.ENRICH_MOVIE_DETAILS and not args.no_enrich,
+            report=_log_reporter(args.log_interval),
+        )
+    except KeyboardInterrupt:
+        logger.warning("Interrupted. Rerun to resume from the crawl journal.")
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        logger.error("Ingestion failed: %s", e, exc_info=args.verbose)
+        return EXIT_FAILED
+
+    manifest = publish_snapshot(df_new)
+    if manifest is None:
+        return EXIT_NOT_SAVED
+    # Only a published snapshot moves the watermark; otherwise the next run re-fetches
+    save_last_sync(fetch_started)
+    if args.export_csv and not save_data_to_csv(df_new):
+        return EXIT_NOT_SAVED
+
+    if stats:
+        logger.info(
+            "Delta sync: %(updated)s updated, %(added)s added, %(removed)s removed", stats
+        )
+    logger.info(
+        "Published snapshot %s (%s movies) in %.1fs",
+        manifest["version"],
+        f"{manifest['rows']:,}",
+        time.monotonic() - started,
+    )
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Small thread-safe TTL and LRU memos for the Streamlit-free data layer
+(stand-ins for st.cache_data so ingestion also runs outside a Streamlit app).
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+_memos = []
+
+
+def ttl_cache(ttl: float, maxsize: int = 4096):
+    """
+    Memoize a function on its arguments for ttl seconds. Exceptions are not cached.
+    The cached object itself is returned, so callers must treat it as read-only.
+    The wrapper gains .clear(); clear_all() clears every memo.
+    """
+
+    def decorator(fn):
+        entries = {}  # key -> (expires_at, value)
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+            value = fn(*args, **kwargs)
+            with lock:
+                if len(entries) >= maxsize:
+                    # Drop expired entries first, then the oldest
+                    for k in [k for k, (exp, _) in entries.items() if exp <= now]:
+                        del entries[k]
+                    if len(entries) >= maxsize:
+                        del entries[next(iter(entries))]
+                entries[key] = (now + ttl, value)
+            return value
+
+        def clear():
+            with lock:
+                entries.clear()
+
+        wrapper.clear = clear
+        _memos.append(wrapper)
+        return wrapper
+
+    return decorator
+
+
+class LRUCache:
+    """
+    Bounded thread-safe mapping that evicts the least recently used key,
+    for memos keyed on something other than a function's arguments.
+    With maxbytes, the values' total nbytes (numpy arrays) is bounded too;
+    the newest entry is always kept.
+    """
+
+    def __init__(self, maxsize: int, maxbytes: int | None = None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        _memos.append(self)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= getattr(self._entries[key], "nbytes", 0)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self.nbytes += getattr(value, "nbytes", 0)
+            while len(self._entries) > self.maxsize or (
+                self.maxbytes is not None
+                and self.nbytes > self.maxbytes
+                and len(self._entries) > 1
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= getattr(evicted, "nbytes", 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+def clear_all() -> None:
+    """Clear every ttl_cache memo and LRUCache in the process."""
+    for memo in _memos:
+        memo.clear()
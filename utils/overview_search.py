@@ -0,0 +1,204 @@
+"""
+Plot search: a BM25 inverted index over movie overviews. Built when a snapshot is
+published (one Arrow file per version, memory-mapped when searched), so a query only
+reads the postings of its own terms and never scans the overview column.
+"""
+
+import logging
+import os
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import config
+from utils.memo import LRUCache
+from utils.text_store import attach_texts
+
+logger = logging.getLogger(__name__)
+
+OVERVIEW_INDEX_FILE = "overviews.arrow"
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Words too common in overviews (or search phrasing) to rank by
+STOPWORDS = frozenset(
+    "about after all also an and are as at be been but by can for from has have he her "
+    "his how in into is it its movie movies film films of on one or she so than that the "
+    "their them then there they this to up was what when where which while who whose "
+    "will with".split()
+)
+
+# dataset key -> OverviewIndex
+_indexes = LRUCache(config.SNAPSHOT_KEEP_VERSIONS)
+_build_lock = threading.Lock()
+
+
+def tokenize(texts: pa.Array) -> pa.ListArray:
+    """Lowercased, accent-free words (letters and digits) of each text; null stays null."""
+    texts = pc.utf8_normalize(texts, form="NFKD")
+    texts = pc.utf8_lower(pc.replace_substring_regex(texts, r"\p{Mn}", ""))
+    return pc.split_pattern_regex(texts, r"[^\p{L}\p{N}]+")
+
+
+def _is_term(words: list) -> np.ndarray:
+    return np.fromiter(
+        (w is not None and len(w) > 1 and w not in STOPWORDS for w in words), bool, len(words)
+    )
+
+
+def _terms(texts: pa.Array) -> tuple[np.ndarray, np.ndarray, list]:
+    """
+    (row, term id) per kept word of texts, and the term vocabulary. Texts are only split
+    on whitespace; the full tokenizer runs once per distinct whitespace token.
+    """
+    chunks = pc.utf8_split_whitespace(texts)
+    counts = pc.fill_null(pc.list_value_length(chunks), 0).to_numpy()
+    chunks = pc.list_flatten(chunks).dictionary_encode()
+    chunk_ids = chunks.indices.to_numpy()
+    chunk_rows = np.repeat(np.arange(len(texts), dtype=np.uint64), counts)
+
+    # Each distinct chunk ("Tokyo," / "Amélie's") becomes zero or more words
+    parts = tokenize(chunks.dictionary)
+    part_counts = pc.fill_null(pc.list_value_length(parts), 0).to_numpy()
+    part_starts = parts.offsets.to_numpy()[:-1]
+    words = pc.list_flatten(parts).dictionary_encode()
+    vocab = words.dictionary.to_pylist()
+    part_ids = np.append(words.indices.to_numpy(), -1)
+    part_ids[:-1][~_is_term(vocab)[part_ids[:-1]]] = -1
+
+    n = part_counts[chunk_ids]
+    first = np.repeat(part_starts[chunk_ids] - (np.cumsum(n) - n), n)
+    ids = part_ids[first + np.arange(n.sum())]
+    rows = np.repeat(chunk_rows, n)
+    keep = ids >= 0
+    return rows[keep], ids[keep], vocab
+
+
+def build_overview_index(overviews: pd.Series) -> pa.Table:
+    """
+    One row per term: the rows (positions in overviews) whose overview contains it,
+    ascending, with each row's precomputed BM25 weight for the term.
+    """
+    rows_total = len(overviews)
+    texts = pa.array(overviews, pa.string(), from_pandas=True)
+    if isinstance(texts, pa.ChunkedArray):
+        # Arrow-backed string columns (e.g. after the delta-sync concat) come in chunks
+        texts = texts.combine_chunks()
+    token_rows, ids, vocab = _terms(texts)
+    lengths = np.bincount(token_rows.astype(np.int64), minlength=rows_total)
+
+    # (term, row) pairs sorted once; runs of equal pairs give term frequencies
+    pairs = np.sort((ids.astype(np.uint64) << np.uint64(32)) | token_rows)
+    starts = np.flatnonzero(np.concatenate([[len(pairs) > 0], pairs[1:] != pairs[:-1]]))
+    tf = np.diff(np.append(starts, len(pairs))).astype(np.float32)
+    pairs = pairs[starts]
+    terms = (pairs >> np.uint64(32)).astype(np.int64)
+    rows = (pairs & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    used = np.unique(terms)
+    offsets = np.searchsorted(terms, np.append(used, np.iinfo(np.int64).max)).astype(np.int32)
+    doc_freq = np.diff(offsets)
+    idf = np.log1p((rows_total - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+    average = max(lengths.mean(), 1.0) if rows_total else 1.0
+    norm = (BM25_K1 * (1 - BM25_B + BM25_B * lengths / average)).astype(np.float32)
+    weights = np.repeat(idf, doc_freq) * tf * (BM25_K1 + 1) / (tf + norm[rows])
+
+    table = pa.table(
+        {
+            "term": pa.array([vocab[i] for i in used], pa.string()),
+            "rows": pa.ListArray.from_arrays(pa.array(offsets), pa.array(rows)),
+            "weights": pa.ListArray.from_arrays(pa.array(offsets), pa.array(weights, pa.float32())),
+        }
+    )
+    return table.replace_schema_metadata({"rows": str(rows_total)})
+
+
+def write_overview_index(df: pd.DataFrame, directory: str) -> None:
+    """Index df's overviews (row positions in df) as one uncompressed Arrow record batch."""
+    overviews = df["overview"] if "overview" in df.columns else pd.Series([None] * len(df))
+    table = build_overview_index(overviews)
+    with pa.OSFile(os.path.join(directory, OVERVIEW_INDEX_FILE), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+
+
+class OverviewIndex:
+    """Postings in CSR form: term i's rows are rows[offsets[i]:offsets[i + 1]]."""
+
+    def __init__(self, table: pa.Table):
+        self.num_rows = int(table.schema.metadata[b"rows"])
+        self.terms = {term: i for i, term in enumerate(table.column("term").to_pylist())}
+        postings = table.column("rows").combine_chunks()
+        self.offsets = postings.offsets.to_numpy()
+        self.rows = postings.values.to_numpy()  # zero-copy views when memory-mapped
+        self.weights = table.column("weights").combine_chunks().values.to_numpy()
+
+    @classmethod
+    def open(cls, path: str) -> "OverviewIndex":
+        return cls(pa.ipc.open_file(pa.memory_map(path, "r")).read_all())
+
+    def search(self, query: str, ranked: bool = True) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Rows with any query term and their BM25 scores, best first (ties in row order),
+        or in row order if not ranked.
+        """
+        words = tokenize(pa.array([query])).flatten().to_pylist()
+        words = [w for w, ok in zip(words, _is_term(words)) if ok]
+        found = [self.terms[w] for w in dict.fromkeys(words) if w in self.terms]
+        if not found:
+            return np.empty(0, np.int64), np.empty(0, np.float32)
+
+        spans = [slice(self.offsets[i], self.offsets[i + 1]) for i in found]
+        rows = np.concatenate([self.rows[s] for s in spans]).astype(np.int64)
+        weights = np.concatenate([self.weights[s] for s in spans])
+        if len(found) > 1 and len(rows) < self.num_rows // 8:
+            rows, inverse = np.unique(rows, return_inverse=True)
+            weights = np.bincount(inverse, weights=weights).astype(np.float32)
+        elif len(found) > 1:
+            # Common terms: sum into a dense score array rather than sorting postings
+            weights = np.bincount(rows, weights=weights, minlength=self.num_rows)
+            rows = np.flatnonzero(weights)
+            weights = weights[rows].astype(np.float32)
+        if not ranked:
+            return rows, weights
+        order = np.argsort(-weights, kind="stable")
+        return rows[order], weights[order]
+
+
+def overview_index(df: pd.DataFrame, key) -> OverviewIndex:
+    """
+    The dataset version's index: the one published with its snapshot, or (for a frame
+    that was never persisted) built in memory on first use. Not memoized without a key.
+    """
+    if key is None:
+        return _load_or_build(df, None)
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+    with _build_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _load_or_build(df, key)
+            _indexes.put(key, index)
+    return index
+
+
+def _load_or_build(df: pd.DataFrame, key) -> OverviewIndex:
+    path = os.path.join(config.SNAPSHOT_DIR, str(key), OVERVIEW_INDEX_FILE)
+    if key is not None and os.path.exists(path):
+        try:
+            index = OverviewIndex.open(path)
+            if index.num_rows == len(df):
+                return index
+            logger.warning("Overview index %s does not match its snapshot; rebuilding", key)
+        except Exception as e:
+            logger.warning("Failed to open overview index %s: %s", key, e)
+
+    if "overview" in df.columns:
+        overviews = df["overview"]
+    else:
+        overviews = attach_texts(df[["id"]], key).get("overview", pd.Series([None] * len(df)))
+    return OverviewIndex(build_overview_index(overviews))
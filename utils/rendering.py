@@ -7,6 +7,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
 import config
+from utils.data_loader import current_snapshot_version
+from utils.text_store import attach_texts
 
 
 def render_metrics(df_all: pd.DataFrame, df_filtered: pd.DataFrame) -> None:
@@ -111,7 +113,8 @@ def render_table_and_details(df_filtered: pd.DataFrame) -> None:
         # If fewer than min_slider movies, show all
         top_n = total_movies
         st.caption(f"Showing all {total_movies} movies")
-    df_display_top = df_display.head(top_n)
+    # Overview etc. come from the text side store, for the shown rows only
+    df_display_top = attach_texts(df_display.head(top_n), current_snapshot_version())
 
     df_table = df_display_top[display_cols].copy()
     df_table.columns = [
@@ -164,6 +167,12 @@ def render_table_and_details(df_filtered: pd.DataFrame) -> None:
             st.write(f"**Language:** {selected_movie['original_language_name']}")
             st.write(f"**Gems Score:** {selected_movie['gems_score']:.3f}")
             st.write(f"**Genres:** {selected_movie.get('genres_str', 'Unknown')}")
+            if pd.notna(selected_movie.get("runtime")):
+                st.write(f"**Runtime:** {int(selected_movie['runtime'])} min")
+            if pd.notna(selected_movie.get("director")):
+                st.write(f"**Director:** {selected_movie['director']}")
+            if pd.notna(selected_movie.get("top_cast")):
+                st.write(f"**Cast:** {selected_movie['top_cast']}")
 
             if pd.notna(selected_movie.get("overview")) and selected_movie["overview"]:
                 st.write("**Overview:**")
@@ -181,6 +190,7 @@ def render_table_and_details(df_filtered: pd.DataFrame) -> None:
 
 def render_cards(df: pd.DataFrame, cards_per_row: int = 3):
     # Card view
+    df = attach_texts(df, current_snapshot_version())
     cols = st.columns(cards_per_row)
     for idx, (_, movie) in enumerate(df.iterrows()):
         col = cols[idx % cards_per_row]
@@ -0,0 +1,140 @@
+"""
+Persistent, compressed cache of raw TMDB responses (SQLite on disk).
+Survives restarts, supports ETag / Last-Modified revalidation and LRU eviction.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import config
+
+
+class CacheMissError(RuntimeError):
+    """Raised in offline mode when a request has no cached response."""
+
+
+class CachedResponse:
+    """A cached body plus the validators needed to revalidate it."""
+
+    def __init__(self, body: bytes, etag: str | None, last_modified: str | None, fetched_at: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def cache_key(url: str, params: dict | None) -> str:
+    """Key on the URL plus every request parameter (order-independent)."""
+    canonical = json.dumps([url, sorted((params or {}).items())], default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe SQLite store of zlib-compressed response bodies with an LRU size cap."""
+
+    def __init__(self, path: str = config.HTTP_CACHE_FILE, max_bytes: int = config.HTTP_CACHE_MAX_BYTES):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        body, etag, last_modified, fetched_at = row
+        return CachedResponse(zlib.decompress(body), etag, last_modified, fetched_at)
+
+    def put(self, key: str, url: str, body: bytes, etag: str | None, last_modified: str | None) -> None:
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, compressed, len(compressed), etag, last_modified, now, now),
+            )
+            self._size += len(compressed) - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as freshly revalidated (after a 304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+            self._conn.commit()
+
+    def expire(self) -> None:
+        """Force every entry to be revalidated on next use, keeping bodies and validators."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = 0")
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is back under 90% of its cap."""
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            evicted.append((key,))
+            self._size -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._size = 0
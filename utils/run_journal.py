@@ -0,0 +1,91 @@
+"""
+On-disk run journal so an interrupted ingestion resumes where it stopped
+instead of starting again from page 1.
+"""
+
+import hashlib
+import json
+import os
+import time
+import config
+
+
+def crawl_run_key(max_pages: int) -> str:
+    """Fingerprint of every setting that shapes the crawl; a changed setting starts a new run."""
+    settings = {
+        "partitioned": config.TMDB_PARTITIONED_CRAWL,
+        "bands": list(config.TMDB_VOTE_COUNT_BANDS),
+        "min_year": config.MIN_YEAR,
+        "max_year": config.MAX_YEAR,
+        "min_vote_average": config.MIN_VOTE_AVERAGE,
+        "min_vote_count": config.MIN_VOTE_COUNT,
+        "max_pages": max_pages,
+    }
+    digest = hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+    return f"crawl-{digest[:12]}"
+
+
+class RunJournal:
+    """
+    Append-only JSON-lines journal of completed pages for one ingestion run.
+    Each line is {"key": ..., "data": ...} and is flushed to disk as it is written,
+    so a crash loses at most the page in flight. Only each key's file offset is held
+    in memory; a replayed page is read back from disk.
+    """
+
+    def __init__(self, run_key: str, max_age: float = config.INGEST_JOURNAL_MAX_AGE):
+        os.makedirs(config.INGEST_JOURNAL_DIR, exist_ok=True)
+        self.path = os.path.join(config.INGEST_JOURNAL_DIR, f"{run_key}.jsonl")
+        self._offsets = {}
+        self._reader = None
+
+        # A journal older than max_age holds stale data: start over
+        if os.path.exists(self.path) and time.time() - os.path.getmtime(self.path) > max_age:
+            os.remove(self.path)
+
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                offset = 0
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn last line from a crash
+                    self._offsets[entry["key"]] = offset
+                    offset += len(line)
+            # Drop a torn tail so new lines start at a line boundary
+            os.truncate(self.path, offset)
+
+        self._file = open(self.path, "ab")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def get(self, key: str) -> dict | None:
+        offset = self._offsets.get(key)
+        if offset is None:
+            return None
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())["data"]
+
+    def record(self, key: str, data: dict) -> None:
+        """Persist one completed page. Only the fields the crawl needs are kept."""
+        data = {"total_pages": data.get("total_pages", 0), "results": data.get("results", [])}
+        self._offsets[key] = self._file.tell()
+        self._file.write((json.dumps({"key": key, "data": data}) + "\n").encode("utf-8"))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def complete(self) -> None:
+        """The run finished: drop the journal."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self) -> None:
+        """Stop writing but keep the journal so the next run can resume."""
+        self._file.close()
+        if self._reader is not None:
+            self._reader.close()
@@ -0,0 +1,83 @@
+"""
+Snapshot schema versions and offline migrations.
+Migrations are pure local transforms (no network, no guessing at load time): an old
+snapshot is upgraded once and republished, so every later load is a plain read.
+"""
+
+from ast import literal_eval
+import numpy as np
+import pandas as pd
+from utils.data_processing import compact_df, map_genres, map_language_names
+from utils.enrichment import ensure_enrichment_columns
+from utils.genre import genre_mask, offline_genre_map
+from utils.tmdb_api import offline_language_names
+
+# Version of the prepared snapshot layout. History:
+#   0: CSV / unversioned Parquet; derived columns may be missing, lists may be strings
+#   1: prepared columns + typed enrichment columns, genre lists as lists
+#   2: unused raw fields dropped, compact dtypes (memory-budget mode)
+#   3: genre_mask bitmask column
+#   4: heavy text columns served from a side store (utils.text_store); same columns
+#   5: BM25 overview index published with each version (utils.overview_search)
+SCHEMA_VERSION = 5
+
+
+def _as_list(value) -> list:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, (tuple, np.ndarray)):
+        return list(value)
+    if isinstance(value, str) and value:
+        try:
+            parsed = literal_eval(value)
+            return parsed if isinstance(parsed, list) else []
+        except (ValueError, SyntaxError):
+            return []
+    return []
+
+
+def _v0_to_v1(df: pd.DataFrame) -> pd.DataFrame:
+    df["release_date"] = pd.to_datetime(df["release_date"], errors="coerce")
+    df["genre_ids"] = df["genre_ids"].map(_as_list)
+
+    if "year" not in df.columns:
+        df["year"] = df["release_date"].dt.year
+    if "gems_score" not in df.columns:
+        df["gems_score"] = (
+            (df["vote_average"] * np.log10(df["vote_count"] + 1)) / (df["popularity"] + 1)
+        ).fillna(0)
+
+    if "genres" in df.columns:
+        df["genres"] = df["genres"].map(_as_list)
+    else:
+        _, df["genres"], df["genres_str"], _ = map_genres(df["genre_ids"], offline_genre_map())
+    if "genres_str" not in df.columns:
+        df["genres_str"] = df["genres"].map(lambda x: ", ".join(x) if x else "Unknown")
+
+    if "original_language_name" not in df.columns:
+        df["original_language_name"] = map_language_names(
+            df["original_language"], offline_language_names()
+        )
+
+    return ensure_enrichment_columns(df)
+
+
+def _v2_to_v3(df: pd.DataFrame) -> pd.DataFrame:
+    df["genre_mask"] = genre_mask(df["genre_ids"])
+    return df
+
+
+# MIGRATIONS[n] upgrades a frame from schema n to n + 1
+# (3 -> 4 and 4 -> 5 only change the files a version is published as)
+MIGRATIONS = {0: _v0_to_v1, 1: compact_df, 2: _v2_to_v3, 3: lambda df: df, 4: lambda df: df}
+
+
+def migrate(df: pd.DataFrame, from_version: int) -> pd.DataFrame:
+    """Upgrade a snapshot frame (owned by the caller) to SCHEMA_VERSION."""
+    if from_version > SCHEMA_VERSION:
+        raise ValueError(
+            f"Snapshot schema {from_version} is newer than supported ({SCHEMA_VERSION})"
+        )
+    for version in range(from_version, SCHEMA_VERSION):
+        df = MIGRATIONS[version](df)
+    return df
@@ -0,0 +1,267 @@
+"""
+Versioned snapshot persistence (pyarrow) for the prepared movie data.
+Each build goes to its own directory under SNAPSHOT_DIR and becomes current when
+manifest.json is atomically replaced, so readers never see a torn or mixed snapshot:
+- Parquet: the complete, typed snapshot; column-selective loads. CSV remains an export format.
+- Arrow IPC: uncompressed copy of the served columns that every server process
+  memory-maps read-only, so sessions and replicas on a host share one copy through
+  the page cache. Heavy text columns go to a side store instead (see utils.text_store);
+  the genre list columns stay in Parquet only (the served frame filters on genre_mask).
+- Optional SQL store (see utils.sql_store), built into the same version directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import config
+from utils.csv_persistence import load_data_from_csv
+from utils.overview_search import OVERVIEW_INDEX_FILE, write_overview_index
+from utils.schema import SCHEMA_VERSION, migrate
+from utils.sql_store import build_sql_store, get_backend
+from utils.text_store import TEXT_FILE, text_columns, write_text_store
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+PARQUET_FILE = "movies.parquet"
+ARROW_FILE = "movies.arrow"
+
+# Version directory names: the UTC build time, so they sort chronologically
+VERSION_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+# Low-cardinality text columns stored dictionary-encoded and loaded as categoricals
+CATEGORICAL_COLUMNS = ("original_language", "original_language_name")
+
+# List columns handed back as Python lists by load_snapshot (what prepare_df and the
+# delta sync expect). Not served: they would be a Python object per row in every process.
+LIST_COLUMNS = ("genre_ids", "genres")
+
+# Serializes schema upgrades so concurrent sessions publish only one new version
+_upgrade_lock = threading.Lock()
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    df = df.copy(deep=False)
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    # Lists written as-is would infer list<null> on an all-empty column
+    for column in LIST_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(lambda x: x if isinstance(x, list) else [])
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _shared_lists(column: pa.ChunkedArray) -> list:
+    """
+    The column as Python lists, built once per distinct list and shared (read-only) by
+    every row holding it, as prepare_df builds them (see map_genres). Rows are grouped
+    by a joined string key in Arrow, so only a few thousand lists are created.
+    """
+    array = column.combine_chunks()
+    if array.null_count:
+        array = array.fill_null(pa.scalar([], array.type))
+    keys = pc.binary_join(pc.cast(array, pa.list_(pa.string())), "\x1f")
+    encoded = keys.dictionary_encode()
+    codes = encoded.indices.to_numpy()
+    # Codes follow first appearance; writing in reverse leaves each code's first row
+    first = np.empty(len(encoded.dictionary), dtype=np.int64)
+    first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+
+    combos = np.empty(len(first), dtype=object)
+    for i, values in enumerate(array.take(pa.array(first)).to_pylist()):
+        combos[i] = values
+    return list(combos[codes])
+
+
+def _to_frame(table: pa.Table) -> pd.DataFrame:
+    lists = [c for c in LIST_COLUMNS if c in table.column_names]
+    # split_blocks keeps null-free numeric columns as views on the table's buffers
+    df = table.drop_columns(lists).to_pandas(use_threads=True, split_blocks=True)
+    for column in lists:
+        df.insert(table.column_names.index(column), column, _shared_lists(table.column(column)))
+    return df
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_file(manifest: dict, name: str) -> str:
+    return os.path.join(config.SNAPSHOT_DIR, manifest["version"], name)
+
+
+def read_manifest() -> dict | None:
+    """The current snapshot's manifest: one small file read, no data touched."""
+    try:
+        with open(os.path.join(config.SNAPSHOT_DIR, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(manifest: dict) -> None:
+    path = os.path.join(config.SNAPSHOT_DIR, MANIFEST_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def _prune_versions(keep: int, grace: float = config.SNAPSHOT_PRUNE_GRACE) -> None:
+    """
+    Delete version directories older than the newest keep once they have been superseded
+    for grace seconds. Until its next rerun remaps, another process may still serve an
+    older version and lazily open its text store, SQL store or overview index.
+    """
+    versions = sorted(
+        entry.name for entry in os.scandir(config.SNAPSHOT_DIR) if entry.is_dir()
+    )
+    now = datetime.now(timezone.utc)
+    for version, successor in zip(versions[:-keep], versions[1:]):
+        try:
+            superseded = datetime.strptime(successor, VERSION_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue  # not a version directory
+        if (now - superseded).total_seconds() >= grace:
+            shutil.rmtree(os.path.join(config.SNAPSHOT_DIR, version), ignore_errors=True)
+
+
+def publish_snapshot(df: pd.DataFrame) -> dict | None:
+    """
+    Write a new snapshot version (df must already have the current schema) and make it
+    current. Returns its manifest, or None on failure (the previous version then stays current).
+    """
+    built_at = datetime.now(timezone.utc)
+    version = built_at.strftime(VERSION_FORMAT)
+    directory = os.path.join(config.SNAPSHOT_DIR, version)
+
+    try:
+        os.makedirs(directory)
+        table = _to_table(df)
+        pq.write_table(table, os.path.join(directory, PARQUET_FILE), compression="zstd")
+
+        # One record batch: every column stays contiguous, so mapping it needs no concatenation
+        served = table.drop_columns(
+            [*text_columns(df), *(c for c in LIST_COLUMNS if c in df.columns)]
+        )
+        arrow_path = os.path.join(directory, ARROW_FILE)
+        with pa.OSFile(arrow_path, "wb") as sink:
+            with pa.ipc.new_file(sink, served.schema) as writer:
+                writer.write_table(served, max_chunksize=max(served.num_rows, 1))
+        write_text_store(df, directory)
+        write_overview_index(df, directory)
+
+        backend = get_backend()
+        if backend != "pandas":
+            build_sql_store(df, version, backend)
+
+        manifest = {
+            "version": version,
+            "schema_version": SCHEMA_VERSION,
+            "rows": table.num_rows,
+            "checksum": f"sha256:{_sha256(arrow_path)}",
+            "built_at": built_at.isoformat(),
+            "files": {
+                "parquet": PARQUET_FILE,
+                "arrow": ARROW_FILE,
+                "texts": TEXT_FILE,
+                "overviews": OVERVIEW_INDEX_FILE,
+            },
+        }
+        _write_manifest(manifest)
+    except Exception as e:
+        logger.error("Failed to publish snapshot: %s", e)
+        shutil.rmtree(directory, ignore_errors=True)
+        return None
+
+    _prune_versions(config.SNAPSHOT_KEEP_VERSIONS)
+    return manifest
+
+
+def load_snapshot(
+    columns: list[str] | None = None, manifest: dict | None = None
+) -> pd.DataFrame | None:
+    """
+    Load the current (or given) snapshot version from Parquet, or only the given columns.
+    Column chunks are decoded on multiple threads straight into typed pandas columns.
+    """
+    manifest = manifest or read_manifest()
+    if manifest is None:
+        return None
+    path = snapshot_file(manifest, PARQUET_FILE)
+
+    try:
+        table = pq.read_table(path, columns=columns, use_threads=True, memory_map=True)
+        return _to_frame(table)
+    except Exception as e:
+        logger.warning("Failed to load snapshot: %s", e)
+        return None
+
+
+def map_snapshot(manifest: dict) -> pd.DataFrame | None:
+    """
+    Memory-map a snapshot version's Arrow file read-only: every column except the text
+    side store's and the genre lists (genre_mask and genres_str cover filtering and
+    display). Numeric, datetime and string columns are zero-copy views on the mapped
+    file (shared page cache, no private copy).
+    The returned frame must be treated as read-only.
+    """
+    try:
+        # The mapping stays alive as long as any column still references it
+        source = pa.memory_map(snapshot_file(manifest, ARROW_FILE), "r")
+        table = pa.ipc.open_file(source).read_all()
+        if table.num_rows != manifest["rows"]:
+            raise ValueError(f"expected {manifest['rows']} rows, found {table.num_rows}")
+        # Versions written before the lists were left out of the Arrow file
+        return _to_frame(table.drop_columns([c for c in LIST_COLUMNS if c in table.column_names]))
+    except Exception as e:
+        logger.warning("Failed to map snapshot %s: %s", manifest.get("version"), e)
+        return None
+
+
+def upgrade_snapshot() -> dict | None:
+    """
+    Return the current manifest, first upgrading older data to SCHEMA_VERSION if needed:
+    an older manifest version, else a pre-versioning Parquet file, else a CSV snapshot.
+    The upgrade is offline and published once, so later loads are plain reads.
+    Returns None when there is nothing to load.
+    """
+    with _upgrade_lock:
+        manifest = read_manifest()
+        if manifest is not None and manifest["schema_version"] == SCHEMA_VERSION:
+            return manifest
+
+        try:
+            if manifest is not None:
+                df = migrate(load_snapshot(manifest=manifest), manifest["schema_version"])
+            elif os.path.exists(config.SNAPSHOT_FILE):
+                df = migrate(pq.read_table(config.SNAPSHOT_FILE).to_pandas(), from_version=0)
+            else:
+                df = load_data_from_csv()
+        except Exception as e:
+            logger.error("Failed to upgrade snapshot: %s", e)
+            return None
+
+        if df is None or len(df) == 0:
+            return None
+        logger.info(
+            "Upgrading snapshot from schema %s to %s",
+            manifest["schema_version"] if manifest else 0,
+            SCHEMA_VERSION,
+        )
+        return publish_snapshot(df)
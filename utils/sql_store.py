@@ -0,0 +1,211 @@
+"""
+Optional embedded SQL backend for Browse All: the snapshot is loaded into an indexed
+SQLite (stdlib) or DuckDB (if installed) file, and filters, title search, sort and
+pagination are compiled into one query, so only the displayed page reaches Python.
+"""
+
+import logging
+import os
+import sqlite3
+import pandas as pd
+import config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+# Scalar columns copied into the store (genre lists go to movie_genres)
+STORE_COLUMNS = [
+    "id", "title", "original_title", "overview", "release_date", "year",
+    "original_language", "original_language_name", "genres_str", "poster_path",
+    "adult", "vote_average", "vote_count", "popularity", "gems_score",
+    "runtime", "budget", "revenue", "director", "top_cast", "keywords",
+]
+
+# Filter and sort columns that get an index (SQLite; DuckDB relies on zone maps)
+INDEXED_COLUMNS = [
+    "vote_average", "popularity", "vote_count", "year", "release_date",
+    "gems_score", "original_title", "original_language_name",
+]
+
+SORTABLE_COLUMNS = {
+    "gems_score", "vote_average", "popularity", "vote_count", "release_date", "original_title",
+}
+
+
+def get_backend() -> str:
+    """The configured backend; "duckdb" falls back to "sqlite" when DuckDB isn't installed."""
+    backend = config.QUERY_BACKEND
+    if backend == "duckdb" and duckdb is None:
+        return "sqlite"
+    return backend
+
+
+def store_path(version: str, backend: str | None = None) -> str:
+    """The store file inside a snapshot version's directory."""
+    backend = backend or get_backend()
+    name = "movies.duckdb" if backend == "duckdb" else "movies.sqlite"
+    return os.path.join(config.SNAPSHOT_DIR, version, name)
+
+
+def store_exists(version: str, backend: str | None = None) -> bool:
+    return os.path.exists(store_path(version, backend))
+
+
+def _store_frames(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    movies = df[[c for c in STORE_COLUMNS if c in df.columns]].copy()
+    movies["adult"] = movies["adult"].astype(bool)
+    movies["release_date"] = movies["release_date"].dt.strftime("%Y-%m-%d")
+    for column in movies.columns:
+        if isinstance(movies[column].dtype, pd.CategoricalDtype):
+            movies[column] = movies[column].astype(object)
+        elif movies[column].dtype == "float32":
+            # Widen via the shortest repr (6.1f -> 6.1, not 6.0999999) so SQL
+            # comparisons against slider values match the pandas filters
+            movies[column] = movies[column].astype(str).astype("float64")
+
+    genres = df[["id", "genres"]].explode("genres").dropna()
+    genres.columns = ["movie_id", "genre"]
+    return movies, genres
+
+
+def build_sql_store(df: pd.DataFrame, version: str, backend: str | None = None) -> bool:
+    """Write a snapshot version's store from its prepared frame (temp file, then renamed)."""
+    backend = backend or get_backend()
+    if backend == "pandas":
+        return False
+
+    path = store_path(version, backend)
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    try:
+        movies, genres = _store_frames(df)
+        if backend == "duckdb":
+            conn = duckdb.connect(tmp_path)
+            conn.register("movies_df", movies)
+            conn.register("genres_df", genres)
+            conn.execute("CREATE TABLE movies AS SELECT * FROM movies_df")
+            conn.execute("CREATE TABLE movie_genres AS SELECT * FROM genres_df")
+        else:
+            conn = sqlite3.connect(tmp_path)
+            movies.to_sql("movies", conn, index=False)
+            genres.to_sql("movie_genres", conn, index=False)
+            conn.execute("CREATE UNIQUE INDEX idx_movies_id ON movies (id)")
+            for column in INDEXED_COLUMNS:
+                if column in movies.columns:
+                    conn.execute(f"CREATE INDEX idx_movies_{column} ON movies ({column})")
+            conn.execute("CREATE INDEX idx_movie_genres ON movie_genres (genre, movie_id)")
+            conn.execute("ANALYZE")
+            conn.commit()
+        conn.close()
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.error("Failed to build %s store: %s", backend, e)
+        return False
+
+
+def _compile_where(filters: dict, search: str, backend: str) -> tuple[str, list]:
+    """Translate the sidebar filters dict (same semantics as filter_df) into a WHERE clause."""
+    clauses = [
+        "vote_average >= ?",
+        "popularity <= ?",
+        "vote_count >= ?",
+    ]
+    params = [filters["min_rating"], filters["max_popularity"], filters["min_vote_count"]]
+
+    if not filters["adult"]:
+        clauses.append("NOT adult")
+    include = list(dict.fromkeys(filters["genres"]))
+    if include:
+        marks = ", ".join("?" * len(include))
+        subquery = f"SELECT movie_id FROM movie_genres WHERE genre IN ({marks})"
+        if filters["genre_match"] == "all":
+            subquery += " GROUP BY movie_id HAVING COUNT(DISTINCT genre) = ?"
+            params += include + [len(include)]
+        else:
+            params += include
+        clauses.append(f"id IN ({subquery})")
+    exclude = list(dict.fromkeys(filters["exclude_genres"]))
+    if exclude:
+        marks = ", ".join("?" * len(exclude))
+        clauses.append(f"id NOT IN (SELECT movie_id FROM movie_genres WHERE genre IN ({marks}))")
+        params += exclude
+    if filters["original_language_name"] != "All":
+        clauses.append("original_language_name = ?")
+        params.append(filters["original_language_name"])
+    if filters["min_year"] is not None:
+        clauses.append("year >= ?")
+        params.append(filters["min_year"])
+    if filters["max_year"] is not None:
+        clauses.append("year <= ?")
+        params.append(filters["max_year"])
+    if not filters["include_missing_dates"]:
+        clauses.append("release_date IS NOT NULL")
+    if search:
+        # Case-insensitive substring match on the title
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        like = "ILIKE" if backend == "duckdb" else "LIKE"
+        clauses.append(f"original_title {like} ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
+
+    return " AND ".join(clauses), params
+
+
+def _connect(version: str, backend: str):
+    path = store_path(version, backend)
+    if backend == "duckdb":
+        return duckdb.connect(path, read_only=True)
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+
+def count_movies(
+    version: str, filters: dict, search: str = "", backend: str | None = None
+) -> int:
+    """Number of movies in a snapshot version matching filters and search."""
+    backend = backend or get_backend()
+    where, params = _compile_where(filters, search, backend)
+    conn = _connect(version, backend)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM movies WHERE {where}", params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def query_movies_page(
+    version: str,
+    filters: dict,
+    search: str = "",
+    sort_column: str = "gems_score",
+    ascending: bool = False,
+    limit: int = 25,
+    offset: int = 0,
+    backend: str | None = None,
+) -> pd.DataFrame:
+    """One sorted page of matching movies (NULLs last, ties broken by id)."""
+    if sort_column not in SORTABLE_COLUMNS:
+        raise ValueError(f"Unsupported sort column: {sort_column}")
+    backend = backend or get_backend()
+    where, params = _compile_where(filters, search, backend)
+    order = "ASC" if ascending else "DESC"
+    sql = (
+        f"SELECT * FROM movies WHERE {where} "
+        f"ORDER BY {sort_column} {order} NULLS LAST, id "
+        f"LIMIT ? OFFSET ?"
+    )
+    conn = _connect(version, backend)
+    try:
+        cursor = conn.execute(sql, params + [limit, offset])
+        columns = [d[0] for d in cursor.description]
+        page = pd.DataFrame(cursor.fetchall(), columns=columns)
+    finally:
+        conn.close()
+
+    page["release_date"] = pd.to_datetime(page["release_date"], errors="coerce")
+    page["adult"] = page["adult"].astype(bool)
+    return page
@@ -0,0 +1,91 @@
+"""
+Side store for heavy text columns (overview, ...): written next to each snapshot
+version, kept out of the served frame and read by id only for the rows on screen.
+"""
+
+import logging
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import config
+from utils.memo import LRUCache
+
+logger = logging.getLogger(__name__)
+
+TEXT_FILE = "texts.arrow"
+
+# Columns only read for displayed movies (details, cards, CSV export)
+TEXT_COLUMNS = ("title", "overview", "top_cast", "keywords")
+
+
+def text_columns(df: pd.DataFrame) -> list[str]:
+    return [c for c in TEXT_COLUMNS if c in df.columns]
+
+
+def write_text_store(df: pd.DataFrame, directory: str) -> None:
+    """Write id + text columns, sorted by id, as one uncompressed Arrow record batch."""
+    texts = df[["id"] + text_columns(df)].sort_values("id")
+    table = pa.Table.from_pandas(texts, preserve_index=False)
+    with pa.OSFile(os.path.join(directory, TEXT_FILE), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+
+
+class TextStore:
+    """A version's text file, memory-mapped; lookups binary-search the sorted ids."""
+
+    def __init__(self, path: str):
+        source = pa.memory_map(path, "r")
+        self.table = pa.ipc.open_file(source).read_all()
+        self.ids = self.table.column("id").to_numpy()  # zero-copy view on the mapping
+
+    def lookup(self, ids, columns) -> pd.DataFrame:
+        """Text columns for the given ids, indexed by id (ids not in the store are left out)."""
+        ids = np.asarray(ids, dtype=self.ids.dtype)
+        rows = np.searchsorted(self.ids, ids).clip(max=max(len(self.ids) - 1, 0))
+        found = rows[self.ids[rows] == ids] if len(self.ids) else rows[:0]
+        texts = self.table.select(["id", *columns]).take(found).to_pandas()
+        return texts.set_index("id")
+
+
+# version -> TextStore; only successful opens, so a failed one is retried next time
+_stores = LRUCache(config.SNAPSHOT_KEEP_VERSIONS)
+
+
+def _open_text_store(version: str) -> TextStore | None:
+    store = _stores.get(version)
+    if store is not None:
+        return store
+    path = os.path.join(config.SNAPSHOT_DIR, version, TEXT_FILE)
+    if not os.path.exists(path):
+        # Not a published version (e.g. the built_at key of an in-memory snapshot), or pruned
+        return None
+    try:
+        store = TextStore(path)
+    except Exception as e:
+        logger.warning("Failed to open text store %s: %s", version, e)
+        return None
+    _stores.put(version, store)
+    return store
+
+
+def attach_texts(df: pd.DataFrame, version: str | None) -> pd.DataFrame:
+    """
+    df with the text columns it lacks filled in from the snapshot version's side store.
+    Meant for the handful of displayed rows; returns df unchanged if nothing is missing.
+    """
+    missing = [c for c in TEXT_COLUMNS if c not in df.columns]
+    if not missing or version is None or len(df) == 0:
+        return df
+
+    store = _open_text_store(version)
+    if store is None:
+        return df
+    missing = [c for c in missing if c in store.table.column_names]
+    texts = store.lookup(df["id"].to_numpy(), missing)
+
+    df = df.copy()
+    for column in missing:
+        df[column] = df["id"].map(texts[column])
+    return df
@@ -0,0 +1,242 @@
+"""
+Title search: a trigram inverted index over original_title and the localized title,
+built once per dataset version. Answers case- and accent-insensitive substring
+queries, and fills in typo-tolerant (edit distance) matches when few titles contain
+the query literally. Results are row positions, best match first.
+"""
+
+import threading
+from typing import Callable
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import config
+from utils.memo import LRUCache
+
+# dataset key -> TitleIndex
+_indexes = LRUCache(config.SNAPSHOT_KEEP_VERSIONS)
+_build_lock = threading.Lock()
+
+
+def _normalize_series(titles: pd.Series) -> pd.Series:
+    """Casefolded titles without accents (nonspacing marks), missing ones as ""."""
+    texts = pa.array(titles.fillna("").astype(str), pa.string(), from_pandas=True)
+    texts = pc.replace_substring_regex(pc.utf8_normalize(texts, form="NFKD"), r"\p{Mn}", "")
+    return texts.to_pandas().reset_index(drop=True).str.casefold()
+
+
+def normalize_title(text: str) -> str:
+    """Casefolded, without accents ("Amélie" -> "amelie"), folded exactly like the index."""
+    return _normalize_series(pd.Series([text])).iloc[0]
+
+
+def _trigram_codes(codes: np.ndarray) -> np.ndarray:
+    """One uint64 per position: three 21-bit code points."""
+    c = codes.astype(np.uint64)
+    return (c[:-2] << np.uint64(42)) | (c[1:-1] << np.uint64(21)) | c[2:]
+
+
+def _query_trigrams(query: str) -> np.ndarray:
+    codes = np.frombuffer(query.encode("utf-32-le"), dtype=np.uint32)
+    return np.unique(_trigram_codes(codes)) if len(codes) >= 3 else np.empty(0, np.uint64)
+
+
+def _edit_distances_in(query: str, texts: list[str]) -> np.ndarray:
+    """
+    Fewest edits turning query into some substring of each text (Sellers' algorithm),
+    one DP column per text position for all texts at once.
+    """
+    q = np.frombuffer(query.encode("utf-32-le"), dtype=np.uint32)
+    width = max(map(len, texts), default=0)
+    # NUL padding never matches, and a match running into it is never the cheapest
+    padded = "".join(text.ljust(width, "\0") for text in texts)
+    codes = np.frombuffer(padded.encode("utf-32-le"), dtype=np.uint32).reshape(len(texts), width)
+
+    steps = np.arange(len(q) + 1)
+    previous = np.tile(steps, (len(texts), 1))
+    best = previous[:, -1].copy()
+    for char in codes.T:
+        # Substitute / match, or skip a text char; then skipping query chars within the
+        # column is a running minimum: current[i] = min_k(cost[k] - k) + i
+        cost = np.minimum(previous[:, :-1] + (q != char[:, None]), previous[:, 1:] + 1)
+        cost = np.concatenate([np.zeros((len(texts), 1), cost.dtype), cost], axis=1)
+        previous = np.minimum.accumulate(cost - steps, axis=1) + steps
+        best = np.minimum(best, previous[:, -1])
+    return best
+
+
+class TitleIndex:
+    """
+    Trigram postings in CSR form: rows containing trigram k are
+    rows[offsets[k]:offsets[k + 1]], sorted and unique.
+    """
+
+    def __init__(self, original_titles: pd.Series, titles: pd.Series | None = None):
+        self.original = _normalize_series(original_titles)
+        # Localized titles only where they differ from the original
+        self.local = None if titles is None else _normalize_series(titles)
+        entries = self.original.tolist()
+        entry_rows = np.arange(len(entries), dtype=np.uint64)
+        if self.local is not None:
+            differs = np.flatnonzero((self.local != self.original).to_numpy())
+            entries += self.local.iloc[differs].tolist()
+            entry_rows = np.concatenate([entry_rows, differs.astype(np.uint64)])
+        # Kept as Arrow strings: ranking candidates runs on Arrow's string kernels
+        self.original = pa.array(self.original, pa.string())
+        self.local = None if self.local is None else pa.array(self.local, pa.string())
+
+        # Every title's code points in one buffer, titles separated by NUL
+        codes = np.frombuffer(("\0".join(entries) + "\0").encode("utf-32-le"), dtype=np.uint32)
+        lengths = np.fromiter((len(t) + 1 for t in entries), dtype=np.int64, count=len(entries))
+        self.lengths = lengths[: len(self.original)] - 1
+        position_rows = np.repeat(entry_rows, lengths)[:-2] if len(codes) >= 3 else entry_rows[:0]
+        trigrams = _trigram_codes(codes) if len(codes) >= 3 else np.empty(0, np.uint64)
+        inside = (codes[:-2] != 0) & (codes[1:-1] != 0) & (codes[2:] != 0)
+
+        ids, self.trigrams = pd.factorize(trigrams[inside])
+        order = np.argsort(self.trigrams)
+        self.trigrams = self.trigrams[order]
+        # Renumber ids so they follow the sorted trigrams (searchsorted on lookup)
+        rank = np.empty(len(order), dtype=np.uint64)
+        rank[order] = np.arange(len(order), dtype=np.uint64)
+
+        # (trigram id, row) pairs, sorted and deduplicated in one 64-bit sort
+        pairs = np.sort((rank[ids] << np.uint64(32)) | position_rows[inside])
+        if len(pairs):
+            pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]
+        self.rows = (pairs & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        self.offsets = np.searchsorted(
+            pairs >> np.uint64(32), np.arange(len(self.trigrams) + 1, dtype=np.uint64)
+        )
+
+    def __len__(self) -> int:
+        return len(self.original)
+
+    def _postings(self, trigrams: np.ndarray) -> list[np.ndarray]:
+        ks = np.searchsorted(self.trigrams, trigrams)
+        postings = []
+        for k, trigram in zip(ks, trigrams):
+            if k < len(self.trigrams) and self.trigrams[k] == trigram:
+                postings.append(self.rows[self.offsets[k] : self.offsets[k + 1]])
+            else:
+                postings.append(self.rows[:0])
+        return postings
+
+    def _texts(self, rows: np.ndarray) -> list[pa.Array]:
+        texts = [self.original.take(rows)]
+        if self.local is not None:
+            texts.append(self.local.take(rows))
+        return texts
+
+    def substring(self, query: str) -> np.ndarray:
+        """Rows whose title contains query, best first: exact, prefix, word start, inside."""
+        trigrams = _query_trigrams(query)
+        if len(trigrams):
+            postings = sorted(self._postings(trigrams), key=len)
+            # Few candidates: binary-search them in each posting (cost ~ the shortest one)
+            if len(postings[0]) * len(postings) < len(self) // 8:
+                candidates = postings[0]
+                for posting in postings[1:]:
+                    if not len(candidates) or not len(posting):
+                        candidates = candidates[:0]
+                        break
+                    at = np.searchsorted(posting, candidates).clip(max=len(posting) - 1)
+                    candidates = candidates[posting[at] == candidates]
+            else:
+                # Common trigrams: rows in every posting, counted in a dense array
+                counts = np.bincount(np.concatenate(postings), minlength=len(self))
+                candidates = np.flatnonzero(counts == len(postings))
+        else:
+            # Too short for a trigram: scan every title
+            candidates = np.arange(len(self))
+
+        rank = np.full(len(candidates), 4)
+        lengths = self.lengths[candidates]
+        for texts in self._texts(candidates):
+            found = pc.find_substring(texts, query).to_numpy(zero_copy_only=False)
+            word = pc.match_substring(texts, " " + query).to_numpy(zero_copy_only=False)
+            exact = pc.utf8_length(texts).to_numpy(zero_copy_only=False) == len(query)
+            rank = np.minimum(rank, np.select(
+                [found == 0, word, found > 0], [np.where(exact, 0, 1), 2, 3], 4
+            ))
+        found = rank < 4
+        # One 64-bit sort on (rank, length, row)
+        keys = (
+            (rank[found].astype(np.int64) << 52)
+            | (np.minimum(lengths[found], (1 << 20) - 1) << 32)
+            | candidates[found]
+        )
+        return np.sort(keys) & 0xFFFFFFFF
+
+    def fuzzy(self, query: str, max_edits: int, limit: int) -> np.ndarray:
+        """
+        Rows whose title contains query within max_edits edits, closest first. Only the
+        limit rows sharing the most query trigrams are scored by edit distance.
+        """
+        trigrams = _query_trigrams(query)
+        if not len(trigrams):
+            return np.empty(0, np.int64)
+        # Each edit destroys at most three of the query's trigrams
+        needed = max(1, len(trigrams) - 3 * max_edits)
+        postings = np.concatenate(self._postings(trigrams))
+        if len(postings) < len(self) // 8:
+            candidates, counts = np.unique(postings, return_counts=True)
+            shared = counts >= needed
+            candidates, counts = candidates[shared], counts[shared]
+        else:
+            # Common trigrams: count into a dense array rather than sorting postings
+            counts = np.bincount(postings, minlength=len(self))
+            candidates = np.flatnonzero(counts >= needed)
+            counts = counts[candidates]
+        if len(candidates) > limit:
+            # The limit highest counts; ties at the cut go to the lowest rows
+            cut = np.partition(counts, len(counts) - limit)[len(counts) - limit]
+            keep = counts > cut
+            keep[np.flatnonzero(counts == cut)[: limit - keep.sum()]] = True
+            candidates, counts = candidates[keep], counts[keep]
+        if not len(candidates):
+            return np.empty(0, np.int64)
+
+        texts = self._texts(candidates)
+        distances = np.min(
+            [_edit_distances_in(query, t.to_pylist()) for t in texts], axis=0
+        )
+        close = distances <= max_edits
+        candidates, counts, distances = candidates[close], counts[close], distances[close]
+        order = np.lexsort((candidates, self.lengths[candidates], -counts, distances))
+        return candidates[order].astype(np.int64)
+
+    def search(self, query: str) -> np.ndarray:
+        """
+        Ranked rows for a search box query: substring matches, then typo-tolerant
+        matches when fewer than SEARCH_FUZZY_BELOW titles contain the query.
+        """
+        query = normalize_title(query.strip())
+        if not query:
+            return np.arange(len(self))
+        rows = self.substring(query)
+        if len(rows) < config.SEARCH_FUZZY_BELOW and len(query) >= 4:
+            max_edits = 1 if len(query) < 8 else 2
+            fuzzy = self.fuzzy(query, max_edits, config.SEARCH_FUZZY_CANDIDATES)
+            rows = np.concatenate([rows, fuzzy[~np.isin(fuzzy, rows)]])
+        return rows
+
+
+def title_index(
+    df: pd.DataFrame, key, load_titles: Callable[[], pd.Series | None] | None = None
+) -> TitleIndex:
+    """
+    The dataset version's index, built on first use. load_titles returns the localized
+    titles aligned with df (they live in the text side store), if available; it is
+    only called when the index is built.
+    """
+    index = _indexes.get(key)
+    if index is None:
+        with _build_lock:
+            index = _indexes.get(key)
+            if index is None:
+                titles = None if load_titles is None else load_titles()
+                index = TitleIndex(df["original_title"], titles)
+                _indexes.put(key, index)
+    return index
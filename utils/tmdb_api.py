@@ -2,122 +2,155 @@
 TMDB API fetching functions for retrieving movie data.
 """
 
-import streamlit as st
 import pandas as pd
 import requests
-import time
+from typing import Callable
 import config
-import os
-from dotenv import load_dotenv
+from utils.columnar import ColumnBuilder
+from utils.fetch_engine import iter_pages
+from utils.fetch_planner import Partition, iter_partition_pages
+from utils.run_journal import RunJournal, crawl_run_key
+from utils.http_client import tmdb_cached_json, tmdb_get_json
+from utils.memo import ttl_cache
 
-# Load environment variables
-load_dotenv()
 
-# Load TMDB Bearer Token from environment variable
-TMDB_BEARER_TOKEN = os.getenv("TMDB_BEARER_TOKEN")
-if not TMDB_BEARER_TOKEN:
-    raise ValueError(
-        "TMDB_BEARER_TOKEN not found in environment variables. Please create a .env file with your token."
-    )
-
-# Ensure token starts with "Bearer " prefix
-if not TMDB_BEARER_TOKEN.startswith("Bearer "):
-    TMDB_BEARER_TOKEN = f"Bearer {TMDB_BEARER_TOKEN}"
-
-
-@st.cache_data(ttl=config.TMDB_CACHE_TTL)
-def fetch_tmdb_page(
+def fetch_discover_page(
     page: int,
     sort_by: str = "popularity.desc",
     language: str = "en-US",
     include_adult: bool = False,
+    release_date_gte: str | None = None,
+    release_date_lte: str | None = None,
+    vote_count_gte: int | None = None,
+    vote_count_lte: int | None = None,
+    max_age: float = config.TMDB_CACHE_TTL,
 ) -> dict:
     """
-    Fetch a single TMDB page. Cached per-page, so multipage reruns won't restart from scratch.
-    Returns JSON dict. If rate limited, returns {"_rate_limited": True}.
+    Fetch a single discover page without in-memory caching (the disk response cache
+    still applies; pass max_age=0 to force revalidation).
+    Release date and vote count bounds default to the configured ranges.
     """
-    headers = {
-        "accept": "application/json",
-        "Authorization": TMDB_BEARER_TOKEN,
-        "accept-encoding": "gzip",
-    }
     params = {
         "include_adult": str(include_adult).lower(),
         "language": language,
         "sort_by": sort_by,
         "page": page,
-        "primary_release_date.gte": f"{config.MIN_YEAR}-01-01",
-        "primary_release_date.lte": f"{config.MAX_YEAR}-12-31",
+        "primary_release_date.gte": release_date_gte or f"{config.MIN_YEAR}-01-01",
+        "primary_release_date.lte": release_date_lte or f"{config.MAX_YEAR}-12-31",
         "vote_average.gte": config.MIN_VOTE_AVERAGE,
-        "vote_count.gte": config.MIN_VOTE_COUNT,
+        "vote_count.gte": max(vote_count_gte or 0, config.MIN_VOTE_COUNT),
     }
+    if vote_count_lte is not None:
+        params["vote_count.lte"] = vote_count_lte
 
-    r = requests.get(config.TMDB_BASE_URL, headers=headers, params=params, timeout=20)
+    return tmdb_get_json(config.TMDB_BASE_URL, params=params, max_age=max_age)
 
-    if r.status_code == 429:
-        return {"_rate_limited": True}
 
-    r.raise_for_status()
-    return r.json()
+def fetch_partition_page(partition: Partition, page: int) -> dict:
+    """Fetch one discover page restricted to a crawl partition (disk-cached, not memoized)."""
+    return fetch_discover_page(
+        page,
+        release_date_gte=partition.release_date_gte.isoformat(),
+        release_date_lte=partition.release_date_lte.isoformat(),
+        vote_count_gte=partition.vote_count_gte,
+        vote_count_lte=partition.vote_count_lte,
+    )
 
 
-@st.cache_data(ttl=config.TMDB_CACHE_TTL)
+def fetch_movies(
+    max_pages: int = config.MAX_TMDB_PAGES,
+    on_progress: Callable[[int, int, int], None] | None = None,
+) -> pd.DataFrame:
+    """
+    Crawl discover and return one row per movie.
+    Uses the partitioned crawl when config.TMDB_PARTITIONED_CRAWL is set
+    (max_pages then caps each partition), otherwise the single popularity query.
+    Each page is converted to typed column chunks as it arrives (see utils.columnar)
+    and pages are not memoized in memory (the disk response cache and the journal
+    cover reruns), so the raw result dicts never accumulate.
+    Every completed page is journaled to disk; a crashed or restarted run resumes
+    from the journal and the journal is dropped once the crawl completes.
+    """
+    journal = RunJournal(crawl_run_key(max_pages))
+    builder = ColumnBuilder()
+    try:
+        if config.TMDB_PARTITIONED_CRAWL:
+            for _, results in iter_partition_pages(
+                fetch_partition_page, max_pages, on_progress, journal=journal
+            ):
+                builder.add(results)
+        else:
+            for page, results in iter_pages(
+                fetch_discover_page, max_pages, on_progress, journal=journal
+            ):
+                builder.add(results, position=page)
+    except BaseException:
+        journal.close()
+        raise
+
+    journal.complete()
+    return builder.to_frame()
+
+
+@ttl_cache(ttl=config.TMDB_CACHE_TTL)
 def _fetch_tmdb_pages_cached(max_pages: int = config.MAX_TMDB_PAGES) -> pd.DataFrame:
     """
     Cached TMDB fetcher: fetches all pages (up to max_pages) and returns one row per movie.
-    Uses per-page cached fetches so it is resilient to Streamlit reruns.
+    Pages run concurrently through the shared rate limiter; each page is cached independently.
     """
-    all_movies = []
-    total_pages_known = None
-
-    backoff = 1.0
-    backoff_max = 10.0
+    df = fetch_movies(max_pages)
 
-    # We still iterate pages sequentially, but each page is cached independently.
-    for page in range(1, max_pages + 1):
-        while True:
-            data = fetch_tmdb_page(page)
+    if df.empty:
+        raise RuntimeError(
+            "No movies fetched. Please check your TMDB token / connection."
+        )
 
-            if isinstance(data, dict) and data.get("_rate_limited"):
-                time.sleep(backoff)
-                backoff = min(backoff * 2, backoff_max)
-                continue
+    return df
 
-            backoff = 1.0
-            break
 
-        if total_pages_known is None:
-            total_pages_known = min(data.get("total_pages", max_pages), max_pages)
+def fetch_tmdb_all_pages(max_pages: int = config.MAX_TMDB_PAGES) -> pd.DataFrame:
+    """Public fetch function. Returns a copy the caller may modify."""
+    return _fetch_tmdb_pages_cached(max_pages=max_pages).copy()
 
-        movies = data.get("results", [])
-        if not movies:
-            break
 
-        all_movies.extend(movies)
+def fetch_movie_changes_page(page: int, start_date: str, end_date: str) -> dict:
+    """Fetch one page of the movie changes feed (IDs changed between two dates)."""
+    params = {"start_date": start_date, "end_date": end_date, "page": page}
+    return tmdb_get_json(config.TMDB_CHANGES_URL, params=params, max_age=0)
 
-        if page >= total_pages_known:
-            break
 
-    if not all_movies:
-        raise RuntimeError(
-            "No movies fetched. Please check your TMDB token / connection."
+def fetch_movie_details(
+    movie_id: int,
+    language: str = "en-US",
+    max_age: float = config.TMDB_CACHE_TTL,
+    append_to_response: str | None = None,
+) -> dict | None:
+    """
+    Fetch /movie/{id}. Returns None if the movie no longer exists on TMDB.
+    append_to_response (e.g. "credits,keywords") folds sub-resources into the same request.
+    """
+    params = {"language": language}
+    if append_to_response:
+        params["append_to_response"] = append_to_response
+    try:
+        return tmdb_get_json(
+            config.TMDB_MOVIE_URL.format(movie_id=movie_id),
+            params=params,
+            max_age=max_age,
         )
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        raise
 
-    return pd.DataFrame(all_movies)
 
-
-def fetch_tmdb_all_pages(max_pages: int = config.MAX_TMDB_PAGES) -> pd.DataFrame:
-    """Public fetch function."""
-    return _fetch_tmdb_pages_cached(max_pages=max_pages)
+@ttl_cache(ttl=config.LANGUAGE_CACHE_TTL)
+def fetch_tmdb_lang_codes() -> pd.DataFrame:
+    data = tmdb_get_json(config.TMDB_LANGUAGES_URL)
+    return pd.DataFrame(data).set_index("iso_639_1")
 
 
-@st.cache_data(ttl=config.LANGUAGE_CACHE_TTL)
-def fetch_tmdb_lang_codes() -> pd.DataFrame:
-    headers = {
-        "accept": "application/json",
-        "Authorization": TMDB_BEARER_TOKEN,
-    }
-    response = requests.get(
-        "https://api.themoviedb.org/3/configuration/languages", headers=headers
-    )
-    return pd.DataFrame(response.json()).set_index("iso_639_1")
+def offline_language_names() -> dict[str, str]:
+    """ISO 639-1 code -> English name from the cached languages response (no network)."""
+    data = tmdb_cached_json(config.TMDB_LANGUAGES_URL) or []
+    return {lang["iso_639_1"]: lang["english_name"] for lang in data}